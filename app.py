@@ -1,217 +1,648 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, url_for, g
 import numpy as np
-import plotly
-import plotly.graph_objects as go
-import json
+import hashlib
 import os
+import time
 from black_scholes import BlackScholes
+from charts import FigureTemplate, vline, dumps
+from cache import ResultCache
+from parallel import ParallelPricer
+from batcher import MicroBatcher
+from metrics import Metrics, SamplingProfiler
+from vol_surface import VolSurface, SurfaceStore
+from heatmap import HeatmapTiler, AXES as HEATMAP_AXES, QUANTITIES as HEATMAP_QUANTITIES
 
 app = Flask(__name__)
+# Number of points sampled along each chart curve
+app.config['CHART_POINTS'] = int(os.environ.get('CHART_POINTS', 100))
+# Precision chart curves are priced in: 'float64' or 'float32' (half the memory, ~1e-6 relative)
+app.config['CHART_PRECISION'] = os.environ.get('CHART_PRECISION', 'float64')
+# Maximum number of contracts accepted by /api/calculate/batch
+app.config['BATCH_MAX_SIZE'] = int(os.environ.get('BATCH_MAX_SIZE', 10000))
+# Number of entries kept in the pricing/chart result cache (0 disables it)
+app.config['RESULT_CACHE_SIZE'] = int(os.environ.get('RESULT_CACHE_SIZE', 1024))
+# Worker processes used to price large batches (0 prices in the request process)
+app.config['PARALLEL_WORKERS'] = int(os.environ.get('PARALLEL_WORKERS', 0))
+# Contracts priced per worker task; smaller batches stay in the request process
+app.config['PARALLEL_CHUNK_SIZE'] = int(os.environ.get('PARALLEL_CHUNK_SIZE', 250000))
+# Browser cache lifetime in seconds for chart responses
+app.config['CHART_MAX_AGE'] = int(os.environ.get('CHART_MAX_AGE', 86400))
+# Window in milliseconds for micro-batching /api/calculate requests (0 disables it)
+app.config['MICROBATCH_WINDOW_MS'] = float(os.environ.get('MICROBATCH_WINDOW_MS', 0))
+# Number of queued requests that closes a micro-batch early
+app.config['MICROBATCH_MAX_SIZE'] = int(os.environ.get('MICROBATCH_MAX_SIZE', 64))
+# Maximum points per axis returned by /api/heatmap
+app.config['HEATMAP_MAX_RESOLUTION'] = int(os.environ.get('HEATMAP_MAX_RESOLUTION', 500))
+# Number of heatmap tiles kept in memory (16 KB each)
+app.config['HEATMAP_TILE_CACHE_SIZE'] = int(os.environ.get('HEATMAP_TILE_CACHE_SIZE', 2048))
+# Calibrated versions kept per vol surface ID
+app.config['VOL_SURFACE_VERSIONS'] = int(os.environ.get('VOL_SURFACE_VERSIONS', 8))
+# Per-route/stage timing histograms served at /metrics (0 turns instrumentation off)
+app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '1') not in ('0', 'false', '')
+# Directory for per-request profiles requested with the X-Profile header (empty disables profiling)
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', '')
+# Sampling interval of the per-request profiler in milliseconds
+app.config['PROFILE_INTERVAL_MS'] = float(os.environ.get('PROFILE_INTERVAL_MS', 1.0))
+
+result_cache = ResultCache(app.config['RESULT_CACHE_SIZE'])
+_parallel_pricer = None
+micro_batcher = None
+if app.config['MICROBATCH_WINDOW_MS'] > 0:
+    micro_batcher = MicroBatcher(app.config['MICROBATCH_WINDOW_MS'], app.config['MICROBATCH_MAX_SIZE'])
+metrics = Metrics(app.config['METRICS_ENABLED'])
+vol_surfaces = SurfaceStore(app.config['VOL_SURFACE_VERSIONS'])
+# Heatmap tiles use their own cache so large grids don't evict prices and charts
+heatmap_tiler = HeatmapTiler(ResultCache(app.config['HEATMAP_TILE_CACHE_SIZE']),
+                             pricer=lambda *params: scale_api_greeks(BlackScholes.price_and_greeks(*params)))
+
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+def record_request(response):
+    route = request.endpoint or 'unmatched'
+    metrics.observe(route, 'total', time.perf_counter() - g.request_start)
+    metrics.count_request(route, response.status_code)
+    return response
+
+def start_profile():
+    if request.headers.get('X-Profile'):
+        g.profiler = SamplingProfiler(app.config['PROFILE_INTERVAL_MS']).start()
+
+def finish_profile(response):
+    """Write the request's folded-stack profile and name the file in the X-Profile header."""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.stop()
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.endpoint}-{os.getpid()}-{id(profiler):x}.folded"
+        with open(os.path.join(app.config['PROFILE_DIR'], name), 'w') as f:
+            f.write(profiler.folded())
+        response.headers['X-Profile'] = name
+    return response
+
+# Hooks are only installed when enabled, so turning them off costs nothing per request
+if metrics.enabled:
+    app.before_request(start_request_timer)
+    app.after_request(record_request)
+if app.config['PROFILE_DIR']:
+    os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+    app.before_request(start_profile)
+    app.after_request(finish_profile)
+
+def batch_engine():
+    """Return the engine for batch pricing: a shared ParallelPricer if enabled, else BlackScholes."""
+    global _parallel_pricer
+    if app.config['PARALLEL_WORKERS'] <= 0:
+        return BlackScholes
+    if _parallel_pricer is None:
+        _parallel_pricer = ParallelPricer(app.config['PARALLEL_WORKERS'], app.config['PARALLEL_CHUNK_SIZE'])
+    return _parallel_pricer
 
 @app.route('/')
 def index():
     """Render the main page with the input form."""
     return render_template('index.html')
 
+def parse_option_params(source):
+    """
+    Read option parameters from a form, query string or JSON mapping.
+    Rates and volatilities are given in percent. If a surface_id (and
+    optionally surface_version) is given, the volatility is read off that
+    calibrated surface at the contract's strike and maturity instead.
+    
+    Returns:
+    tuple: (S0, K, r, T, sigma) quantized to the result cache resolution
+    """
+    S0 = float(source.get('stock_price', 100))
+    K = float(source.get('strike_price', 100))
+    r = float(source.get('interest_rate', 0.05)) / 100  # Convert from percent
+    T = float(source.get('maturity', 1.0))
+    if source.get('surface_id'):
+        surface = vol_surfaces.get(source['surface_id'], source.get('surface_version'))
+        sigma = surface.implied_vol(K, T)
+    else:
+        sigma = float(source.get('volatility', 0.2)) / 100  # Convert from percent
+    return result_cache.quantize(S0, K, r, T, sigma)
+
 @app.route('/calculate', methods=['POST'])
 def calculate():
     """Calculate option prices and Greeks based on user input."""
     # Get user inputs
-    S0 = float(request.form.get('stock_price', 100))
-    K = float(request.form.get('strike_price', 100))
-    r = float(request.form.get('interest_rate', 0.05)) / 100  # Convert from percent
-    T = float(request.form.get('maturity', 1.0))
-    sigma = float(request.form.get('volatility', 0.2)) / 100  # Convert from percent
-
-    # Calculate option prices
-    call_price = BlackScholes.call_price(S0, K, r, T, sigma)
-    put_price = BlackScholes.put_price(S0, K, r, T, sigma)
-    
-    # Calculate Greeks
-    delta_call = BlackScholes.delta_call(S0, K, r, T, sigma)
-    delta_put = BlackScholes.delta_put(S0, K, r, T, sigma)
-    gamma = BlackScholes.gamma(S0, K, r, T, sigma)
-    vega = BlackScholes.vega(S0, K, r, T, sigma)
-    theta_call = BlackScholes.theta_call(S0, K, r, T, sigma)
-    theta_put = BlackScholes.theta_put(S0, K, r, T, sigma)
-    rho_call = BlackScholes.rho_call(S0, K, r, T, sigma)
-    rho_put = BlackScholes.rho_put(S0, K, r, T, sigma)
-    
-    # Generate chart data
-    stock_price_chart = generate_price_vs_stock_chart(S0, K, r, T, sigma)
-    volatility_chart = generate_price_vs_volatility_chart(S0, K, r, T, sigma)
-    greeks_chart = generate_greeks_chart(S0, K, r, T, sigma)
-    
-    return render_template('results.html',
-                          stock_price=S0,
-                          strike_price=K,
-                          interest_rate=r*100,  # Convert to percentage
-                          maturity=T,
-                          volatility=sigma*100,  # Convert to percentage
-                          call_price=call_price,
-                          put_price=put_price,
-                          delta_call=delta_call,
-                          delta_put=delta_put,
-                          gamma=gamma,
-                          vega=vega,
-                          theta_call=theta_call,
-                          theta_put=theta_put,
-                          rho_call=rho_call,
-                          rho_put=rho_put,
-                          stock_price_chart=stock_price_chart,
-                          volatility_chart=volatility_chart,
-                          greeks_chart=greeks_chart)
-
-def generate_price_vs_stock_chart(S0, K, r, T, sigma):
-    """Generate JSON for stock price vs option price chart."""
-    S_values = np.linspace(K/2, K*1.5, 100)
-    call_prices = [BlackScholes.call_price(S, K, r, T, sigma) for S in S_values]
-    put_prices = [BlackScholes.put_price(S, K, r, T, sigma) for S in S_values]
-    
-    # Create the Plotly figure
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=S_values, y=call_prices, mode='lines', name='Call Option', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=S_values, y=put_prices, mode='lines', name='Put Option', line=dict(color='red')))
-    
-    fig.add_shape(
-        type="line",
-        x0=K, y0=0, x1=K, y1=max(np.max(call_prices), np.max(put_prices)),
-        line=dict(color="black", width=1, dash="dash")
-    )
+    with metrics.timer('calculate', 'parse'):
+        S0, K, r, T, sigma = params = parse_option_params(request.form)
+
+    # Calculate option prices and Greeks in one pass
+    with metrics.timer('calculate', 'price'):
+        results = result_cache.get_or_compute(
+            ('prices',) + params, lambda: BlackScholes.price_and_greeks(*params))
     
-    fig.add_shape(
-        type="line",
-        x0=S0, y0=0, x1=S0, y1=max(np.max(call_prices), np.max(put_prices)),
-        line=dict(color="orange", width=1, dash="dash")
-    )
+    # Charts are fetched lazily by the page from their own endpoints
+    query = dict(stock_price=S0, strike_price=K, interest_rate=r*100, maturity=T, volatility=sigma*100)
+    chart_urls = {name: url_for('api_chart', name=name, **query) for name in CHART_GENERATORS}
+    heatmap_urls = {axes: url_for('api_heatmap', axes=axes, format='chart', **query) for axes in HEATMAP_AXES}
     
-    fig.update_layout(
-        title='Option Prices vs Stock Price',
-        xaxis_title='Stock Price ($)',
-        yaxis_title='Option Price ($)',
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=0.01
-        ),
-        hovermode="x unified"
-    )
+    with metrics.timer('calculate', 'render'):
+        return render_template('results.html',
+                               stock_price=S0,
+                               strike_price=K,
+                               interest_rate=r*100,  # Convert to percentage
+                               maturity=T,
+                               volatility=sigma*100,  # Convert to percentage
+                               **results,
+                               chart_urls=chart_urls,
+                               heatmap_urls=heatmap_urls)
+
+# Chart skeletons, validated and serialized once at startup
+LEGEND = dict(yanchor="top", y=0.99, xanchor="left", x=0.01)
+
+PRICE_VS_STOCK_TEMPLATE = FigureTemplate(
+    [dict(mode='lines', name='Call Option', line=dict(color='blue')),
+     dict(mode='lines', name='Put Option', line=dict(color='red'))],
+    title='Option Prices vs Stock Price',
+    xaxis_title='Stock Price ($)',
+    yaxis_title='Option Price ($)',
+    legend=LEGEND,
+    hovermode="x unified"
+)
+
+PRICE_VS_VOLATILITY_TEMPLATE = FigureTemplate(
+    [dict(mode='lines', name='Call Option', line=dict(color='blue')),
+     dict(mode='lines', name='Put Option', line=dict(color='red'))],
+    title='Option Prices vs Volatility',
+    xaxis_title='Volatility (%)',
+    yaxis_title='Option Price ($)',
+    legend=LEGEND,
+    hovermode="x unified"
+)
+
+GREEKS_TEMPLATE = FigureTemplate(
+    [dict(mode='lines', name='Delta', line=dict(color='blue')),
+     dict(mode='lines', name='Gamma', line=dict(color='green')),
+     dict(mode='lines', name='Vega (÷100)', line=dict(color='red')),
+     dict(mode='lines', name='Theta (daily)', line=dict(color='cyan'))],
+    title='Option Greeks vs Stock Price',
+    xaxis_title='Stock Price ($)',
+    yaxis_title='Greek Value',
+    legend=LEGEND,
+    hovermode="x unified"
+)
+
+def generate_price_vs_stock_chart(S0, K, r, T, sigma, num_points=100, dtype=None):
+    """Generate JSON for stock price vs option price chart."""
+    S_values = np.linspace(K/2, K*1.5, num_points)
+    curves = BlackScholes.surface(S_values, K, r, T, sigma, dtype)
+    call_prices = curves['call_price']
+    put_prices = curves['put_price']
     
-    return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+    y_max = max(np.max(call_prices), np.max(put_prices))
+    return PRICE_VS_STOCK_TEMPLATE.render(
+        S_values, [call_prices, put_prices],
+        shapes=[vline(K, 0, y_max, "black"), vline(S0, 0, y_max, "orange")])
 
-def generate_price_vs_volatility_chart(S0, K, r, T, sigma):
+def generate_price_vs_volatility_chart(S0, K, r, T, sigma, num_points=100, dtype=None):
     """Generate JSON for volatility vs option price chart."""
-    sigma_values = np.linspace(0.01, 0.5, 100)
-    call_prices = [BlackScholes.call_price(S0, K, r, T, vol) for vol in sigma_values]
-    put_prices = [BlackScholes.put_price(S0, K, r, T, vol) for vol in sigma_values]
-    
-    # Create the Plotly figure
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=sigma_values*100, y=call_prices, mode='lines', name='Call Option', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=sigma_values*100, y=put_prices, mode='lines', name='Put Option', line=dict(color='red')))
-    
-    fig.add_shape(
-        type="line",
-        x0=sigma*100, y0=0, x1=sigma*100, y1=max(np.max(call_prices), np.max(put_prices)),
-        line=dict(color="black", width=1, dash="dash")
-    )
-    
-    fig.update_layout(
-        title='Option Prices vs Volatility',
-        xaxis_title='Volatility (%)',
-        yaxis_title='Option Price ($)',
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=0.01
-        ),
-        hovermode="x unified"
-    )
+    sigma_values = np.linspace(0.01, 0.5, num_points)
+    curves = BlackScholes.surface(S0, K, r, T, sigma_values, dtype)
+    call_prices = curves['call_price']
+    put_prices = curves['put_price']
     
-    return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+    y_max = max(np.max(call_prices), np.max(put_prices))
+    return PRICE_VS_VOLATILITY_TEMPLATE.render(
+        sigma_values*100, [call_prices, put_prices],
+        shapes=[vline(sigma*100, 0, y_max, "black")])
 
-def generate_greeks_chart(S0, K, r, T, sigma):
+def generate_greeks_chart(S0, K, r, T, sigma, num_points=100, dtype=None):
     """Generate JSON for stock price vs Greeks chart."""
-    S_values = np.linspace(K*0.5, K*1.5, 100)
+    S_values = np.linspace(K*0.5, K*1.5, num_points)
     
     # Calculate Greeks for call options
-    delta_call = [BlackScholes.delta_call(S, K, r, T, sigma) for S in S_values]
-    gamma = [BlackScholes.gamma(S, K, r, T, sigma) for S in S_values]
-    vega = [BlackScholes.vega(S, K, r, T, sigma) / 100 for S in S_values]  # Scaled for better visibility
-    theta_call = [BlackScholes.theta_call(S, K, r, T, sigma) / 365 for S in S_values]  # Daily theta
-    
-    # Create the Plotly figure
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=S_values, y=delta_call, mode='lines', name='Delta', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=S_values, y=gamma, mode='lines', name='Gamma', line=dict(color='green')))
-    fig.add_trace(go.Scatter(x=S_values, y=vega, mode='lines', name='Vega (÷100)', line=dict(color='red')))
-    fig.add_trace(go.Scatter(x=S_values, y=theta_call, mode='lines', name='Theta (daily)', line=dict(color='cyan')))
-    
-    fig.add_shape(
-        type="line",
-        x0=K, y0=np.min(theta_call), x1=K, y1=np.max(delta_call),
-        line=dict(color="black", width=1, dash="dash")
-    )
+    curves = BlackScholes.surface(S_values, K, r, T, sigma, dtype)
+    delta_call = curves['delta_call']
+    gamma = curves['gamma']
+    vega = curves['vega'] / 100  # Scaled for better visibility
+    theta_call = curves['theta_call'] / 365  # Daily theta
     
-    fig.add_shape(
-        type="line",
-        x0=S0, y0=np.min(theta_call), x1=S0, y1=np.max(delta_call),
-        line=dict(color="orange", width=1, dash="dash")
-    )
-    
-    fig.update_layout(
-        title='Option Greeks vs Stock Price',
+    y_min, y_max = np.min(theta_call), np.max(delta_call)
+    return GREEKS_TEMPLATE.render(
+        S_values, [delta_call, gamma, vega, theta_call],
+        shapes=[vline(K, y_min, y_max, "black"), vline(S0, y_min, y_max, "orange")])
+
+HEATMAP_TEMPLATES = {
+    'spot_vol': FigureTemplate(
+        [dict(colorscale='Viridis')], trace_type='Heatmap',
+        title='Option Heatmap: Stock Price vs Volatility',
+        xaxis_title='Stock Price ($)',
+        yaxis_title='Volatility (%)'
+    ),
+    'spot_time': FigureTemplate(
+        [dict(colorscale='Viridis')], trace_type='Heatmap',
+        title='Option Heatmap: Stock Price vs Time to Maturity',
         xaxis_title='Stock Price ($)',
-        yaxis_title='Greek Value',
-        legend=dict(
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=0.01
-        ),
-        hovermode="x unified"
+        yaxis_title='Time to Maturity (years)'
     )
+}
+
+# Chart generators by name, as used in result cache keys
+CHART_GENERATORS = {
+    'stock': generate_price_vs_stock_chart,
+    'volatility': generate_price_vs_volatility_chart,
+    'greeks': generate_greeks_chart
+}
+
+def warm_up():
+    """
+    Load the lazily imported chart stack, build the chart templates,
+    compile the page templates and run the pricing kernels once. Called
+    before forking (gunicorn --preload) so workers share the result
+    copy-on-write instead of each paying for it on its first request.
+    """
+    for template in (PRICE_VS_STOCK_TEMPLATE, PRICE_VS_VOLATILITY_TEMPLATE, GREEKS_TEMPLATE,
+                     *HEATMAP_TEMPLATES.values()):
+        template.build()
+    for name in ('index.html', 'results.html'):
+        app.jinja_env.get_template(name)
+    BlackScholes.price_and_greeks(100.0, 100.0, 0.05, 1.0, 0.2)
+    for generate in CHART_GENERATORS.values():
+        generate(100.0, 100.0, 0.05, 1.0, 0.2, 10)
+
+def cached_chart(name, params):
+    """Return the serialized chart JSON for params, building it on a cache miss."""
+    num_points = app.config['CHART_POINTS']
+    precision = app.config['CHART_PRECISION']
+
+    def generate():
+        # Timed inside the cache so only real chart builds are measured
+        with metrics.timer('api_chart', f'generate_{name}'):
+            return CHART_GENERATORS[name](*params, num_points, np.dtype(precision))
+    return result_cache.get_or_compute(('chart', name, num_points, precision) + params, generate)
+
+def chart_etag(name, params, num_points, precision='float64'):
+    """Derive a stable ETag for a chart from its name, input parameters and settings."""
+    settings = (name, num_points) if precision == 'float64' else (name, num_points, precision)
+    return hashlib.sha1(repr(settings + params).encode()).hexdigest()
+
+@app.route('/api/chart/<name>')
+def api_chart(name):
+    """
+    Serve one chart's figure JSON for the parameters in the query string.
+    Responses carry an ETag derived from the parameters, so repeated
+    requests are answered with 304 Not Modified without recomputing.
+    """
+    if name not in CHART_GENERATORS:
+        return jsonify({'error': f'unknown chart {name}'}), 404
+    try:
+        with metrics.timer('api_chart', 'parse'):
+            params = parse_option_params(request.args)
+    except ValueError:
+        return jsonify({'error': 'invalid option parameters'}), 400
     
-    return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
+    etag = chart_etag(name, params, app.config['CHART_POINTS'], app.config['CHART_PRECISION'])
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(cached_chart(name, params), mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['CHART_MAX_AGE']
+    return response
+
+# Response formats of /api/heatmap
+HEATMAP_FORMATS = ('json', 'binary', 'chart')
+
+def parse_heatmap_args(source, axes, K, T):
+    """
+    Read the heatmap quantity, axis ranges, resolution and format from a
+    query string. Volatilities are given in percent; ranges default to
+    50-150% of the strike, 1-100% volatility or 0.01 years to twice the
+    maturity.
+
+    Returns:
+    tuple: (quantity, x_range, y_range, resolution, format) with ranges
+           in model units
+    """
+    quantity = source.get('quantity', 'call_price')
+    if quantity not in HEATMAP_QUANTITIES:
+        raise ValueError(f'quantity must be one of {", ".join(HEATMAP_QUANTITIES)}')
+    fmt = source.get('format', 'json')
+    if fmt not in HEATMAP_FORMATS:
+        raise ValueError(f'format must be one of {", ".join(HEATMAP_FORMATS)}')
+    y_scale = 100 if axes == 'spot_vol' else 1  # Volatility from percent
+    y_default = (1, 100) if axes == 'spot_vol' else (0.01, 2 * T)
+    x_range = (float(source.get('x_min', K * 0.5)), float(source.get('x_max', K * 1.5)))
+    y_range = tuple(float(source.get(name, default)) / y_scale
+                    for name, default in zip(('y_min', 'y_max'), y_default))
+    if not all(np.isfinite(x_range + y_range)) or x_range[0] >= x_range[1] or y_range[0] >= y_range[1]:
+        raise ValueError('axis ranges must be finite with min < max')
+    resolution = int(source.get('resolution', 200))
+    if not 2 <= resolution <= app.config['HEATMAP_MAX_RESOLUTION']:
+        raise ValueError(f"resolution must be between 2 and {app.config['HEATMAP_MAX_RESOLUTION']}")
+    return quantity, x_range, y_range, resolution, fmt
+
+@app.route('/api/heatmap/<axes>')
+def api_heatmap(axes):
+    """
+    Serve a 2-D price or Greek grid over stock price and volatility
+    (spot_vol) or stock price and time to maturity (spot_time), holding
+    the other option parameters fixed. The grid is assembled from cached
+    tiles and capped at `resolution` points per axis. Greeks are scaled
+    as in /api/calculate.
+
+    format=json returns {x, y, z} with z as one row per y value,
+    format=chart a Plotly heatmap figure and format=binary the raw arrays:
+    x as little-endian float64, then y as float64, then z row by row as
+    float32, with the shape in the X-Heatmap-Shape header (rows,columns).
+    """
+    if axes not in HEATMAP_AXES:
+        return jsonify({'error': f'unknown heatmap {axes}'}), 404
+    try:
+        with metrics.timer('api_heatmap', 'parse'):
+            S0, K, r, T, sigma = params = parse_option_params(request.args)
+            quantity, x_range, y_range, resolution, fmt = heatmap = parse_heatmap_args(request.args, axes, K, T)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    etag = hashlib.sha1(repr((axes,) + params + heatmap).encode()).hexdigest()
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        fixed = (K, r, T) if axes == 'spot_vol' else (K, r, sigma)
+        try:
+            with metrics.timer('api_heatmap', 'tiles'):
+                x, y, z = heatmap_tiler.grid(axes, quantity, fixed, x_range, y_range, resolution)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        with metrics.timer('api_heatmap', 'serialize'):
+            if axes == 'spot_vol':
+                y = y * 100  # Convert to percent
+            if fmt == 'binary':
+                body = x.astype('<f8').tobytes() + y.astype('<f8').tobytes() + z.astype('<f4').tobytes()
+                response = app.response_class(body, mimetype='application/octet-stream')
+                response.headers['X-Heatmap-Shape'] = f'{len(y)},{len(x)}'
+            elif fmt == 'chart':
+                figure = HEATMAP_TEMPLATES[axes].render_heatmap(
+                    x, y, z, shapes=[vline(S0, y[0], y[-1], 'orange')],
+                    name=quantity, colorbar={'title': {'text': quantity}})
+                response = app.response_class(figure, mimetype='application/json')
+            else:
+                response = app.response_class(dumps({'axes': axes, 'quantity': quantity, 'x': x, 'y': y, 'z': z}),
+                                              mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['CHART_MAX_AGE']
+    return response
 
 @app.route('/api/calculate', methods=['POST'])
 def api_calculate():
     """API endpoint for AJAX calculations."""
-    data = request.json
-    S0 = float(data.get('stock_price', 100))
-    K = float(data.get('strike_price', 100))
-    r = float(data.get('interest_rate', 0.05)) / 100  # Convert from percent
-    T = float(data.get('maturity', 1.0))
-    sigma = float(data.get('volatility', 0.2)) / 100  # Convert from percent
-    
-    # Calculate option prices
-    call_price = BlackScholes.call_price(S0, K, r, T, sigma)
-    put_price = BlackScholes.put_price(S0, K, r, T, sigma)
-    
-    # Calculate Greeks
-    delta_call = BlackScholes.delta_call(S0, K, r, T, sigma)
-    delta_put = BlackScholes.delta_put(S0, K, r, T, sigma)
-    gamma = BlackScholes.gamma(S0, K, r, T, sigma)
-    vega = BlackScholes.vega(S0, K, r, T, sigma)
-    theta_call = BlackScholes.theta_call(S0, K, r, T, sigma) / 365  # Daily
-    theta_put = BlackScholes.theta_put(S0, K, r, T, sigma) / 365  # Daily
-    rho_call = BlackScholes.rho_call(S0, K, r, T, sigma) / 100  # Scaled
-    rho_put = BlackScholes.rho_put(S0, K, r, T, sigma) / 100  # Scaled
-    
-    return jsonify({
-        'call_price': call_price,
-        'put_price': put_price,
-        'delta_call': delta_call,
-        'delta_put': delta_put,
-        'gamma': gamma,
-        'vega': vega,
-        'theta_call': theta_call,
-        'theta_put': theta_put,
-        'rho_call': rho_call,
-        'rho_put': rho_put
-    })
+    try:
+        with metrics.timer('api_calculate', 'parse'):
+            params = parse_option_params(request.json)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    with metrics.timer('api_calculate', 'price'):
+        results = api_payload(params)
+    with metrics.timer('api_calculate', 'serialize'):
+        return jsonify(results)
+
+def api_payload(params):
+    """Return the /api/calculate payload for quantized params, via the result cache."""
+    # Calculate option prices and Greeks in one pass
+    # Misses share one vectorized call with concurrent requests when micro-batching is on
+    engine = micro_batcher or BlackScholes
+    return result_cache.get_or_compute(
+        ('api',) + params, lambda: scale_api_greeks(engine.price_and_greeks(*params)))
+
+def scale_api_greeks(results):
+    """Convert theta to a daily figure and scale rho, as reported by the API."""
+    results['theta_call'] = results['theta_call'] / 365  # Daily
+    results['theta_put'] = results['theta_put'] / 365  # Daily
+    results['rho_call'] = results['rho_call'] / 100  # Scaled
+    results['rho_put'] = results['rho_put'] / 100  # Scaled
+    return results
+
+# Input fields accepted by the API, with their defaults
+API_FIELDS = {
+    'stock_price': 100,
+    'strike_price': 100,
+    'interest_rate': 0.05,
+    'maturity': 1.0,
+    'volatility': 0.2
+}
+
+# Row validation rules for batch pricing, checked in order
+BATCH_RULES = [
+    ('stock_price', 'stock_price must be positive'),
+    ('strike_price', 'strike_price must be positive'),
+    ('maturity', 'maturity must be positive'),
+    ('volatility', 'volatility must be positive')
+]
+
+def parse_batch_columns(data):
+    """
+    Turn a batch request body into one float array per API field.
+    The body is either a mapping of field -> list (scalars are broadcast)
+    or a list of contract objects, optionally wrapped as {"contracts": [...]}.
+    Values that cannot be read as numbers become NaN so they are reported
+    per row rather than failing the whole request.
+    """
+    if isinstance(data, dict) and 'contracts' in data:
+        data = data['contracts']
+    if isinstance(data, list):
+        if not all(isinstance(row, dict) for row in data):
+            raise ValueError('contracts must be a list of objects')
+        columns = {field: [row.get(field, default) for row in data]
+                   for field, default in API_FIELDS.items()}
+    elif isinstance(data, dict):
+        columns = {field: data.get(field, default) for field, default in API_FIELDS.items()}
+    else:
+        raise ValueError('request body must be an object or a list of contracts')
+    
+    arrays = [_float_column(columns[field]) for field in API_FIELDS]
+    if any(a.ndim > 1 for a in arrays):
+        raise ValueError('batch inputs must be scalars or flat lists')
+    try:
+        arrays = np.broadcast_arrays(*arrays)
+    except ValueError:
+        raise ValueError('batch inputs must all have the same length')
+    return dict(zip(API_FIELDS, (np.atleast_1d(a) for a in arrays)))
+
+def _float_column(values):
+    """Convert a JSON scalar or list to a float array, mapping bad entries to NaN."""
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        if not isinstance(values, list):
+            return np.asarray(np.nan)
+        return np.array([_float_or_nan(v) for v in values], dtype=float)
+
+def _float_or_nan(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def validate_batch(columns):
+    """
+    Check every row of a batch.
+    
+    Returns:
+    tuple: (boolean mask of valid rows, list of {"index", "error"} dicts)
+    """
+    n = len(columns['stock_price'])
+    messages = np.full(n, None, dtype=object)
+    invalid = ~np.logical_and.reduce([np.isfinite(columns[field]) for field in API_FIELDS])
+    messages[invalid] = 'inputs must be finite numbers'
+    for field, message in BATCH_RULES:
+        bad = ~invalid & (columns[field] <= 0)
+        messages[bad] = message
+        invalid |= bad
+    return ~invalid, [{'index': int(i), 'error': messages[i]} for i in np.flatnonzero(invalid)]
+
+@app.route('/api/calculate/batch', methods=['POST'])
+def api_calculate_batch():
+    """API endpoint for pricing a whole option chain in one vectorized pass."""
+    data = request.get_json(silent=True)
+    try:
+        columns = parse_batch_columns(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    n = len(columns['stock_price'])
+    max_size = app.config['BATCH_MAX_SIZE']
+    if n > max_size:
+        return jsonify({'error': f'batch of {n} contracts exceeds the maximum of {max_size}'}), 413
+    
+    if isinstance(data, dict) and data.get('surface_id'):
+        try:
+            surface = vol_surfaces.get(data['surface_id'], data.get('surface_version'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Invalid strikes or maturities give NaN and are reported per row
+            columns['volatility'] = surface.implied_vol(columns['strike_price'], columns['maturity']) * 100
+    
+    with metrics.timer('api_calculate_batch', 'validate'):
+        valid, errors = validate_batch(columns)
+    with metrics.timer('api_calculate_batch', 'price'):
+        results = scale_api_greeks(batch_engine().price_and_greeks(
+            columns['stock_price'][valid],
+            columns['strike_price'][valid],
+            columns['interest_rate'][valid] / 100,  # Convert from percent
+            columns['maturity'][valid],
+            columns['volatility'][valid] / 100  # Convert from percent
+        ))
+    
+    with metrics.timer('api_calculate_batch', 'serialize'):
+        output = {}
+        for name, values in results.items():
+            column = np.full(n, None, dtype=object)
+            column[valid] = values.tolist()
+            output[name] = column.tolist()
+        
+        return jsonify({
+            'count': n,
+            'valid': int(valid.sum()),
+            'results': output,
+            'errors': errors
+        })
+
+@app.route('/api/implied_vol', methods=['POST'])
+def api_implied_vol():
+    """
+    API endpoint for backing out implied volatility from option prices.
+    Accepts scalars or equal-length lists and returns the volatility in
+    percent, or null where the price admits no solution.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or 'option_price' not in data:
+        return jsonify({'error': 'option_price is required'}), 400
+    
+    option_type = data.get('option_type', 'call')
+    columns = [_float_column(data['option_price'])]
+    columns += [_float_column(data.get(field, API_FIELDS[field]))
+                for field in ('stock_price', 'strike_price', 'interest_rate', 'maturity')]
+    try:
+        price, S, K, r, T, option_type = np.broadcast_arrays(*columns, np.asarray(option_type))
+    except ValueError:
+        return jsonify({'error': 'inputs must all have the same length'}), 400
+    if price.ndim > 1 or price.size > app.config['BATCH_MAX_SIZE']:
+        return jsonify({'error': 'inputs must be scalars or flat lists within the batch limit'}), 400
+    
+    try:
+        with metrics.timer('api_implied_vol', 'solve'):
+            vol = BlackScholes.implied_vol(price, S, K, r / 100, T, option_type)  # Convert rate from percent
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    vol = np.asarray(vol * 100, dtype=object)  # Convert to percent
+    vol[np.isnan(vol.astype(float))] = None
+    return jsonify({'implied_volatility': vol.tolist()})
+
+@app.route('/api/cache/stats')
+def api_cache_stats():
+    """Report result cache size and hit/miss counters."""
+    return jsonify(result_cache.stats())
+
+@app.route('/api/microbatch/stats')
+def api_microbatch_stats():
+    """Report micro-batch size distribution and queueing latency."""
+    if micro_batcher is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(micro_batcher.stats(), enabled=True))
+
+@app.route('/api/vol_surface', methods=['POST'])
+def api_vol_surface():
+    """
+    Calibrate an SVI vol surface from implied vol quotes and publish it as
+    a new version of surface_id (a fresh ID if none is given). Pricing
+    requests can then pass surface_id instead of volatility.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not all(f in data for f in ('strike_price', 'maturity', 'volatility')):
+        return jsonify({'error': 'strike_price, maturity and volatility lists are required'}), 400
+    try:
+        S = float(data.get('stock_price', API_FIELDS['stock_price']))
+        r = float(data.get('interest_rate', API_FIELDS['interest_rate'])) / 100  # Convert from percent
+        quotes = np.broadcast_arrays(*(_float_column(data[f]) for f in ('strike_price', 'maturity', 'volatility')))
+        K, T, vol = (q / scale for q, scale in zip(quotes, (1, 1, 100)))  # Vols from percent
+        if K.size > app.config['BATCH_MAX_SIZE']:
+            raise ValueError('too many quotes')
+        with metrics.timer('api_vol_surface', 'calibrate'):
+            surface = VolSurface.calibrate(S, r, K, T, vol)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    surface_id, version = vol_surfaces.put(surface, data.get('surface_id'))
+    return jsonify(dict(surface.to_dict(), surface_id=surface_id, version=version,
+                        max_fit_error=surface.fit_error(K, T, vol) * 100))  # In vol percent
+
+@app.route('/api/vol_surface/<surface_id>')
+def api_vol_surface_info(surface_id):
+    """Return a surface's coefficients (latest or ?version=N) and its available versions."""
+    try:
+        surface = vol_surfaces.get(surface_id, request.args.get('version'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify(dict(surface.to_dict(), surface_id=surface_id,
+                        versions={str(v): t for v, t in vol_surfaces.versions(surface_id).items()}))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Serve stage timing histograms and cache counters in the Prometheus text format."""
+    if not metrics.enabled:
+        return jsonify({'error': 'metrics are disabled'}), 404
+    cache = result_cache.stats()
+    extra = [('result_cache_hits_total', 'counter', 'Result cache hits', cache['hits']),
+             ('result_cache_misses_total', 'counter', 'Result cache misses', cache['misses']),
+             ('result_cache_entries', 'gauge', 'Entries in the result cache', cache['size'])]
+    tiles = heatmap_tiler.cache.stats()
+    extra += [('heatmap_tile_hits_total', 'counter', 'Heatmap tiles served from cache', tiles['hits']),
+              ('heatmap_tile_misses_total', 'counter', 'Heatmap tiles priced', tiles['misses'])]
+    if micro_batcher is not None:
+        batches = micro_batcher.stats()
+        extra += [('microbatch_batches_total', 'counter', 'Micro-batches priced', batches['batches']),
+                  ('microbatch_requests_total', 'counter', 'Requests priced in micro-batches',
+                   batches['requests'])]
+    return app.response_class(metrics.render(extra), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     # Use environment variable PORT if available (for deployment), otherwise use 5000
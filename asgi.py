@@ -0,0 +1,210 @@
+"""
+High-concurrency ASGI serving mode for the pricing app.
+
+Serves the same routes as app.py. /api/calculate is handled natively on
+the event loop: parameter sets are coalesced so concurrent identical
+requests compute once, and the pricing itself runs on a small bounded
+thread pool. Every other route is forwarded to the Flask app on a
+separate thread pool, so slow chart renders cannot starve pricing calls.
+
+Run with:
+    uvicorn asgi:app --workers 4
+or under gunicorn:
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+"""
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+import app as flask_app
+
+# Threads used for native pricing work and for forwarded Flask requests
+PRICING_THREADS = int(os.environ.get('ASGI_PRICING_THREADS', 4))
+WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 16))
+# Whether the Flask app honours X-Profile (see PROFILE_DIR)
+PROFILING = bool(flask_app.app.config['PROFILE_DIR'])
+
+class Coalescer:
+    """
+    Runs blocking functions on a bounded executor, sharing one computation
+    between all concurrent callers that use the same key.
+    """
+
+    def __init__(self, executor):
+        self._executor = executor
+        self._inflight = {}
+        self.computed = 0
+        self.coalesced = 0
+
+    async def run(self, key, func):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, func)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.computed += 1
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled client does not cancel the shared work
+        return await asyncio.shield(future)
+
+pricing_executor = ThreadPoolExecutor(PRICING_THREADS, thread_name_prefix='pricing')
+wsgi_executor = ThreadPoolExecutor(WSGI_THREADS, thread_name_prefix='wsgi')
+coalescer = Coalescer(pricing_executor)
+
+async def read_body(receive):
+    """Collect the full request body from the ASGI receive channel."""
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+async def send_response(send, status, body, content_type=b'application/json', headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]
+                   + list(headers)
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+def _json_bytes(obj):
+    # Formatted like Flask's jsonify so both serving modes return identical bodies
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode() + b'\n'
+
+def _has_header(scope, name):
+    return any(key == name and value for key, value in scope.get('headers', []))
+
+def _json_object(scope, body):
+    """Return the request body as a dict if it is a JSON object sent as JSON, else None."""
+    content_type = dict(scope.get('headers', [])).get(b'content-type', b'').split(b';')[0].strip().lower()
+    if content_type != b'application/json' and not (
+            content_type.startswith(b'application/') and content_type.endswith(b'+json')):
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+async def api_calculate(scope, receive, send):
+    """
+    Native /api/calculate: coalesced, cached pricing on the pricing pool.
+    Bodies Flask would reject before pricing (not JSON, not an object,
+    non-numeric types) are forwarded to it, so errors match as well.
+    So are requests asking for a profile, which is taken by the Flask hooks.
+    """
+    started = time.perf_counter()
+    metrics = flask_app.metrics
+    body = await read_body(receive)
+    data = _json_object(scope, body)
+    if data is None or (PROFILING and _has_header(scope, b'x-profile')):
+        await forward_to_flask(scope, receive, send, body)
+        return
+    try:
+        with metrics.timer('api_calculate', 'parse'):
+            params = flask_app.parse_option_params(data)
+    except ValueError as e:
+        status, response = 400, _json_bytes({'error': str(e)})
+    except (TypeError, AttributeError):
+        await forward_to_flask(scope, receive, send, body)
+        return
+    else:
+        with metrics.timer('api_calculate', 'price'):
+            results = await coalescer.run(params, lambda: flask_app.api_payload(params))
+        with metrics.timer('api_calculate', 'serialize'):
+            status, response = 200, _json_bytes({k: float(v) for k, v in results.items()})
+    if metrics.enabled:
+        # Recorded like the Flask request hooks, which this route bypasses
+        metrics.observe('api_calculate', 'total', time.perf_counter() - started)
+        metrics.count_request('api_calculate', status)
+    await send_response(send, status, response)
+
+def _wsgi_environ(scope, body):
+    """Build a WSGI environ for an ASGI HTTP scope."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ[name] = value
+            continue
+        if name in ('CONTENT_LENGTH', 'TRANSFER_ENCODING'):
+            continue  # Describe the wire framing, not the buffered body
+        key = 'HTTP_' + name
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    # The body is already buffered and de-chunked, so its length is always known
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+def _run_wsgi(environ):
+    """Run the Flask app for one request and return (status, headers, body)."""
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = headers
+
+    chunks = flask_app.app(environ, start_response)
+    try:
+        body = b''.join(chunks)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+    return response['status'], response['headers'], body
+
+async def forward_to_flask(scope, receive, send, body=None):
+    """Serve a request through the Flask app on the WSGI thread pool."""
+    environ = _wsgi_environ(scope, await read_body(receive) if body is None else body)
+    status, headers, body = await asyncio.get_running_loop().run_in_executor(
+        wsgi_executor, _run_wsgi, environ)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                pricing_executor.shutdown(wait=False)
+                wsgi_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+    if scope['method'] == 'POST' and scope['path'] == '/api/calculate':
+        await api_calculate(scope, receive, send)
+    elif scope['path'] == '/api/coalescer/stats':
+        await send_response(send, 200, _json_bytes(
+            {'computed': coalescer.computed, 'coalesced': coalescer.coalesced}))
+    else:
+        await forward_to_flask(scope, receive, send)
@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+from black_scholes import BlackScholes
+
+class MicroBatcher:
+    """
+    Aggregates single-contract pricing requests from many threads into one
+    vectorized BlackScholes call. A background thread waits for the first
+    request, keeps collecting until the window closes or max_batch requests
+    are queued, prices them together and resolves each caller's Future.
+    """
+
+    def __init__(self, window_ms=1.0, max_batch=64, latency_samples=10000):
+        """
+        Initialize an idle batcher; the worker thread starts on first use.
+
+        Parameters:
+        window_ms (float): How long a batch stays open after its first request
+        max_batch (int): Number of requests that closes a batch early
+        latency_samples (int): Recent queueing latencies kept for percentiles
+        """
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.requests = 0
+        self._sizes = {}
+        self._latencies = deque(maxlen=latency_samples)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._thread.start()
+
+    def submit(self, params):
+        """
+        Queue one contract for the next batch.
+
+        Parameters:
+        params (tuple): (S, K, r, T, sigma) for a single contract
+
+        Returns:
+        Future: Resolves to the price_and_greeks dict of scalars for the contract
+        """
+        if self._thread is None:
+            self._start()
+        future = Future()
+        self._queue.put((params, future, time.perf_counter()))
+        return future
+
+    def price_and_greeks(self, S, K, r, T, sigma):
+        """Price one contract through the batcher, blocking until its batch completes."""
+        return self.submit((S, K, r, T, sigma)).result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                columns = np.array([params for params, _, _ in batch], dtype=np.float64).T
+                results = BlackScholes.price_and_greeks(*columns)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            finally:
+                self._record(len(batch), [started - queued for _, _, queued in batch])
+            for i, (_, future, _) in enumerate(batch):
+                future.set_result({name: values[i] for name, values in results.items()})
+
+    def _record(self, size, latencies):
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+            self._sizes[size] = self._sizes.get(size, 0) + 1
+            self._latencies.extend(latencies)
+
+    def stats(self):
+        """
+        Report the batch size distribution and the queueing latency added
+        to requests (time from submit until their batch starts pricing).
+        """
+        with self._lock:
+            latencies = np.array(self._latencies) * 1e3
+            sizes = dict(sorted(self._sizes.items()))
+            batches, requests = self.batches, self.requests
+        return {
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch,
+            'batches': batches,
+            'requests': requests,
+            'mean_batch_size': requests / batches if batches else 0.0,
+            'batch_sizes': sizes,
+            'queue_ms': {
+                'p50': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                'p99': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+                'max': float(latencies.max()) if len(latencies) else 0.0
+            }
+        }
@@ -0,0 +1,43 @@
+"""
+Benchmark suite for the Black-Scholes pricer and the Flask endpoints.
+
+Run with ``python -m bench``; results are printed as JSON so that runs
+from different commits can be diffed.
+"""
+import time
+import numpy as np
+
+def measure(func, repeat=50, number=1):
+    """
+    Time a zero-argument callable.
+    
+    Parameters:
+    func (callable): Function to benchmark
+    repeat (int): Number of timed samples
+    number (int): Calls per sample; each sample is the mean over these calls
+    
+    Returns:
+    dict: Per-call latency statistics in microseconds
+    """
+    func()  # Warm up caches and lazy initialization
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples[i] = (time.perf_counter() - start) / number
+    samples *= 1e6
+    return {
+        'repeat': repeat,
+        'number': number,
+        'mean_us': float(samples.mean()),
+        'p50_us': float(np.percentile(samples, 50)),
+        'p99_us': float(np.percentile(samples, 99)),
+        'min_us': float(samples.min())
+    }
+
+def throughput(stats, contracts):
+    """Add a contracts-per-second figure to a measure() result."""
+    stats = dict(stats, contracts=contracts)
+    stats['contracts_per_sec'] = contracts / (stats['p50_us'] * 1e-6)
+    return stats
@@ -0,0 +1,55 @@
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import numpy as np
+import bench
+from bench.suites import SUITES
+
+def git_revision():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    """Run the selected benchmark suites and write the results as JSON."""
+    parser = argparse.ArgumentParser(prog='python -m bench', description=bench.__doc__)
+    parser.add_argument('suites', nargs='*',
+                        help=f"Suites to run: {', '.join(SUITES)} (default: all)")
+    parser.add_argument('--quick', action='store_true',
+                        help='Fewer repetitions and no 1e6-contract runs')
+    parser.add_argument('--output', '-o', help='Write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'quick': args.quick
+        },
+        'results': {}
+    }
+    for name in args.suites or SUITES:
+        print(f'Running {name}...', file=sys.stderr)
+        report['results'][name] = SUITES[name](quick=args.quick)
+    
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    main()
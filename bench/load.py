@@ -0,0 +1,156 @@
+"""
+HTTP load generator for comparing serving modes.
+
+Opens a fixed number of keep-alive connections and drives requests over
+them concurrently, then reports throughput and latency percentiles as
+JSON. With --serve it starts the app itself, either as the current sync
+deployment (gunicorn app:app) or in ASGI mode (uvicorn asgi:app).
+
+    python -m bench.load --serve sync --concurrency 200 --requests 20000
+    python -m bench.load --serve asgi --concurrency 200 --requests 20000
+    python -m bench.load --url http://127.0.0.1:8000 --path /api/calculate
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+import numpy as np
+
+SERVE_COMMANDS = {
+    'sync': ['gunicorn', 'app:app', '--bind', '127.0.0.1:{port}', '--workers', '{workers}'],
+    'asgi': ['uvicorn', 'asgi:app', '--host', '127.0.0.1', '--port', '{port}', '--workers', '{workers}',
+             '--log-level', 'warning']
+}
+
+DEFAULT_BODY = {'stock_price': 100, 'strike_price': 105, 'interest_rate': 5,
+                'maturity': 1, 'volatility': 20}
+
+async def _read_response(reader):
+    """
+    Read one HTTP/1.1 response and return (status, keep_alive).
+    Servers without keep-alive (gunicorn's sync workers) close after each response.
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    length = 0
+    keep_alive = True
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection' and value.strip().lower() == 'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+async def _worker(host, port, request, count, latencies, errors):
+    writer = None
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+            if not keep_alive:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+async def run_load(url, path, body, concurrency, requests, vary=False):
+    """
+    Drive requests against url and return throughput/latency statistics.
+    With vary, each connection sends a distinct stock price so requests
+    cannot be coalesced or served from the cache.
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    per_worker = max(requests // concurrency, 1)
+    latencies, errors = [], []
+
+    def build(i):
+        payload = dict(body, stock_price=body['stock_price'] + i * 1e-3) if vary else body
+        data = json.dumps(payload).encode()
+        return (f'POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n'
+                f'Content-Length: {len(data)}\r\n\r\n').encode() + data
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(host, port, build(i), per_worker, latencies, errors)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    ms = np.array(latencies) * 1e3
+    return {
+        'url': url + path,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': elapsed,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max())
+    }
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server did not start on port {port}')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.load', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default=None, help='Base URL of a running server')
+    parser.add_argument('--serve', choices=list(SERVE_COMMANDS), help='Start the app in this mode')
+    parser.add_argument('--workers', type=int, default=1, help='Server worker processes with --serve')
+    parser.add_argument('--path', default='/api/calculate')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--vary', action='store_true',
+                        help='Send distinct parameters per connection (defeats caching/coalescing)')
+    args = parser.parse_args(argv)
+    if not args.url and not args.serve:
+        parser.error('one of --url or --serve is required')
+
+    server = None
+    url = args.url
+    if args.serve:
+        port = _free_port()
+        command = [part.format(port=port, workers=args.workers) for part in SERVE_COMMANDS[args.serve]]
+        server = subprocess.Popen(command)
+        url = f'http://127.0.0.1:{port}'
+    try:
+        if server is not None:
+            _wait_for_port(port)
+        result = asyncio.run(run_load(url, args.path, DEFAULT_BODY, args.concurrency,
+                                      args.requests, args.vary))
+        result['mode'] = args.serve
+        print(json.dumps(result, indent=2))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+from black_scholes import BlackScholes
+from bench import measure, throughput
+
+GREEKS = ('call_price', 'put_price', 'delta_call', 'delta_put', 'gamma', 'vega',
+          'theta_call', 'theta_put', 'rho_call', 'rho_put')
+
+def random_contracts(n, seed=0):
+    """Generate n random but realistic contracts as (S, K, r, T, sigma) arrays."""
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(50, 150, n), rng.uniform(50, 150, n), rng.uniform(0.0, 0.1, n),
+            rng.uniform(0.05, 3.0, n), rng.uniform(0.05, 0.8, n))
+
+def bench_scalar_vs_array(quick=False):
+    """Compare per-contract scalar calls against one vectorized call."""
+    results = {}
+    sizes = (1, 1000) if quick else (1, 1000, 1000000)
+    for n in sizes:
+        S, K, r, T, sigma = random_contracts(n)
+        repeat = 5 if n >= 1000000 else 20
+        if n <= 1000:
+            rows = list(zip(*(a.tolist() for a in (S, K, r, T, sigma))))
+            def scalar_loop():
+                for row in rows:
+                    BlackScholes.price_and_greeks(*row)
+            results[f'scalar_{n}'] = throughput(measure(scalar_loop, repeat), n)
+        results[f'array_{n}'] = throughput(
+            measure(lambda: BlackScholes.price_and_greeks(S, K, r, T, sigma), repeat), n)
+    return results
+
+def bench_greeks(quick=False):
+    """Time each individual pricing/Greek method against the fused kernel."""
+    repeat = 20 if quick else 200
+    scalar = (100.0, 105.0, 0.05, 1.0, 0.2)
+    array = random_contracts(1000)
+    results = {}
+    for name in GREEKS + ('price_and_greeks',):
+        method = getattr(BlackScholes, name)
+        results[name] = {
+            'scalar': measure(lambda: method(*scalar), repeat, 10),
+            'array_1000': measure(lambda: method(*array), repeat)
+        }
+    return results
+
+def bench_kernels(quick=False):
+    """
+    Compare the NumPy and compiled (Numba) price_and_greeks kernels:
+    throughput per array size and the largest relative difference
+    between their outputs. Skipped when Numba is not installed.
+    """
+    import black_scholes
+    import jit_kernels
+    if not jit_kernels.AVAILABLE:
+        return {'skipped': 'numba is not installed'}
+    previous = black_scholes.get_kernel_backend()
+    results = {}
+    try:
+        for n in ((100000,) if quick else (100000, 1000000, 10000000)):
+            args = random_contracts(n)
+            outputs = {}
+            for backend in ('numpy', 'numba'):
+                black_scholes.set_kernel_backend(backend)
+                outputs[backend] = BlackScholes.price_and_greeks(*args)
+                results[f'{backend}_{n}'] = throughput(
+                    measure(lambda: BlackScholes.price_and_greeks(*args), 3 if n >= 10000000 else 10), n)
+            results[f'max_rel_diff_{n}'] = max(
+                float(np.max(np.abs(outputs['numba'][name] - outputs['numpy'][name])
+                             / np.maximum(np.abs(outputs['numpy'][name]), 1.0)))
+                for name in GREEKS)
+    finally:
+        black_scholes.set_kernel_backend(previous)
+    return results
+
+def bench_charts(quick=False):
+    """Time the chart generators at the default and a high resolution."""
+    import app
+    repeat = 10 if quick else 100
+    results = {}
+    for num_points in (100, 10000):
+        for name, generate in app.CHART_GENERATORS.items():
+            results[f'{name}_{num_points}'] = measure(
+                lambda: generate(100.0, 105.0, 0.05, 1.0, 0.2, num_points), repeat)
+    return results
+
+def bench_endpoints(quick=False, use_cache=False):
+    """
+    Time end-to-end requests through the Flask test client.
+    The result cache is disabled unless use_cache is set, so every
+    request pays the full computation cost.
+    """
+    import app
+    if not use_cache:
+        app.result_cache.maxsize = 0
+        app.result_cache.clear()
+    client = app.app.test_client()
+    repeat = 20 if quick else 200
+    form = {'stock_price': '100', 'strike_price': '105', 'interest_rate': '5',
+            'maturity': '1', 'volatility': '20'}
+    S, K, r, T, sigma = random_contracts(1000)
+    batch = {'stock_price': S.tolist(), 'strike_price': K.tolist(),
+             'interest_rate': (r * 100).tolist(), 'maturity': T.tolist(),
+             'volatility': (sigma * 100).tolist()}
+    query = '&'.join(f'{k}={v}' for k, v in form.items())
+    results = {
+        'calculate': measure(lambda: client.post('/calculate', data=form), repeat),
+        'api_calculate': measure(lambda: client.post('/api/calculate', json=form), repeat),
+        'api_calculate_batch_1000': throughput(
+            measure(lambda: client.post('/api/calculate/batch', json=batch), repeat // 2 or 1), 1000)
+    }
+    for name in app.CHART_GENERATORS:
+        url = f'/api/chart/{name}?{query}'
+        results[f'api_chart_{name}'] = measure(lambda: client.get(url), repeat)
+    return results
+
+def bench_scenarios(quick=False):
+    """
+    Time a stress grid over a book of positions: the scenario engine's
+    broadcast revaluation against per-contract scalar pricing calls.
+    """
+    from chain import OptionChain
+    from scenarios import ScenarioEngine
+    n = 100 if quick else 1000
+    S, K, r, T, sigma = random_contracts(n)
+    positions = OptionChain(S, K, r, T, sigma, np.where(np.arange(n) % 2, 'call', 'put'), 1.0)
+    engine = ScenarioEngine(positions)
+    shocks = dict(spot=np.linspace(-0.2, 0.2, 11), vol=np.linspace(-0.1, 0.1, 5),
+                  rate=(-0.01, 0.0, 0.01), horizon=(0.0, 1 / 52))
+    scenarios = 11 * 5 * 3 * 2
+    rows = list(zip(*(a.tolist() for a in (S, K, r, T, sigma))))
+
+    def scalar_scenario():
+        # One scenario's worth of the per-contract loop this replaces
+        for i, row in enumerate(rows):
+            (BlackScholes.call_price if i % 2 else BlackScholes.put_price)(*row)
+    return {
+        'engine': throughput(measure(lambda: engine.run(**shocks), 5 if quick else 20), n * scenarios),
+        'scalar_per_scenario': throughput(measure(scalar_scenario, 5), n)
+    }
+
+def bench_heatmap(quick=False):
+    """
+    Time 500 x 500 spot/vol heatmaps built from tiles: with an empty tile
+    cache, fully cached, and panned by 10% of the range per call, against
+    per-point scalar pricing.
+    """
+    from cache import ResultCache
+    from heatmap import HeatmapTiler
+    repeat = 5 if quick else 20
+    fixed, vols, resolution = (105.0, 0.05, 1.0), (0.01, 1.0), 500
+    points = resolution * resolution
+
+    def cold():
+        HeatmapTiler(ResultCache(4096)).grid('spot_vol', 'call_price', fixed, (50.0, 150.0), vols, resolution)
+    tiler = HeatmapTiler(ResultCache(4096))
+    warm = lambda: tiler.grid('spot_vol', 'call_price', fixed, (50.0, 150.0), vols, resolution)
+    panned = HeatmapTiler(ResultCache(4096))
+    offset = iter(range(10**6))
+
+    def pan():
+        shift = 10.0 * next(offset)
+        panned.grid('spot_vol', 'call_price', fixed, (50.0 + shift, 150.0 + shift), vols, resolution)
+    rows = [(S, 105.0, 0.05, 1.0, 0.2) for S in np.linspace(50, 150, 1000).tolist()]
+
+    def scalar_loop():
+        for row in rows:
+            BlackScholes.price_and_greeks(*row)
+    return {
+        'cold': throughput(measure(cold, repeat), points),
+        'warm': throughput(measure(warm, repeat), points),
+        'pan_10pct': throughput(measure(pan, repeat), points),
+        'scalar_per_point': throughput(measure(scalar_loop, repeat), len(rows))
+    }
+
+# Run in a fresh interpreter: import the app, then serve one request
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+client.post({path!r}, json={{'stock_price': 100}}) if {post} else client.get({path!r})
+served = time.perf_counter()
+print(json.dumps({{'import_ms': (imported - start) * 1e3, 'first_request_ms': (served - imported) * 1e3,
+                  'modules': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# Modules whose import dominates worker boot time
+HEAVY_MODULES = ('plotly', 'plotly.graph_objects', 'scipy.stats', 'scipy.linalg', 'matplotlib')
+
+def bench_startup(quick=False):
+    """
+    Measure cold start in fresh interpreters: the time to import the app,
+    the time to serve the first request on each path, and which
+    heavyweight modules that request has loaded.
+    """
+    repeat = 3 if quick else 10
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    query = 'stock_price=100&strike_price=105&interest_rate=5&maturity=1&volatility=20'
+    paths = {'api_calculate': ('/api/calculate', True), 'chart': (f'/api/chart/stock?{query}', False)}
+    results = {}
+    for name, (path, post) in paths.items():
+        script = STARTUP_SCRIPT.format(path=path, post=post, heavy=HEAVY_MODULES)
+        runs = [json.loads(subprocess.run([sys.executable, '-c', script], cwd=root, check=True,
+                                          capture_output=True, text=True).stdout)
+                for _ in range(repeat)]
+        import_ms = np.array([run['import_ms'] for run in runs])
+        request_ms = np.array([run['first_request_ms'] for run in runs])
+        results[name] = {
+            'repeat': repeat,
+            'import_p50_ms': float(np.percentile(import_ms, 50)),
+            'first_request_p50_ms': float(np.percentile(request_ms, 50)),
+            'total_p50_ms': float(np.percentile(import_ms + request_ms, 50)),
+            'heavy_modules_loaded': runs[-1]['modules']
+        }
+    return results
+
+SUITES = {
+    'scalar_vs_array': bench_scalar_vs_array,
+    'greeks': bench_greeks,
+    'kernels': bench_kernels,
+    'charts': bench_charts,
+    'endpoints': bench_endpoints,
+    'scenarios': bench_scenarios,
+    'heatmap': bench_heatmap,
+    'startup': bench_startup
+}
@@ -0,0 +1,132 @@
+import numpy as np
+from black_scholes import norm_cdf, norm_pdf
+
+# Outputs available from an OptionBook, matching BlackScholes.price_and_greeks
+OUTPUTS = ('call_price', 'put_price', 'delta_call', 'delta_put', 'gamma', 'vega',
+           'theta_call', 'theta_put', 'rho_call', 'rho_put')
+
+class OptionBook:
+    """
+    A stateful book of contracts held as arrays, for tick-driven repricing.
+
+    Every term that depends on a subset of the inputs is cached per contract:
+    log(K), sqrt(T), the discounted strike K*exp(-rT), sigma*sqrt(T) and the
+    drift (r + sigma^2/2)*T. update_spot, update_vol and update_rate refresh
+    only the terms their input feeds, then d1, d2 and the three normal terms
+    for the affected contracts. Prices and Greeks are derived from those on
+    first access; once cached, an update recomputes them for the affected
+    contracts only, so a spot tick costs one log, two cdfs, one pdf and a
+    few multiplies per contract whatever the size of the book.
+    """
+
+    def __init__(self, S, K=None, r=None, T=None, sigma=None):
+        """
+        Parameters:
+        S (array or OptionChain): Current stock prices, or a chain supplying all inputs
+        K (array): Strike prices
+        r (array): Risk-free interest rates
+        T (array): Times to maturity in years
+        sigma (array): Volatilities of the underlying assets
+        """
+        if hasattr(S, 'pricing_args'):
+            S, K, r, T, sigma = S.pricing_args()
+        S, K, r, T, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, r, T, sigma)))
+        self.S, self.K, self.r, self.T, self.sigma = (np.array(a, ndmin=1) for a in (S, K, r, T, sigma))
+        self.log_S = np.log(self.S)
+        self.log_K = np.log(self.K)
+        self.sqrt_T = np.sqrt(self.T)
+        self.discounted_K = self.K * np.exp(-self.r * self.T)
+        self.sigma_sqrt_T = self.sigma * self.sqrt_T
+        self.drift = (self.r + 0.5 * self.sigma**2) * self.T
+        self.d1 = np.empty_like(self.S)
+        self.d2 = np.empty_like(self.S)
+        self.cdf_d1 = np.empty_like(self.S)
+        self.cdf_d2 = np.empty_like(self.S)
+        self.pdf_d1 = np.empty_like(self.S)
+        self._results = {}
+        self._refresh(slice(None))
+
+    def __len__(self):
+        return len(self.S)
+
+    def _refresh(self, index):
+        """Recompute d1, d2 and the normal terms for the selected contracts."""
+        d1 = (self.log_S[index] - self.log_K[index] + self.drift[index]) / self.sigma_sqrt_T[index]
+        d2 = d1 - self.sigma_sqrt_T[index]
+        self.d1[index] = d1
+        self.d2[index] = d2
+        self.cdf_d1[index] = norm_cdf(d1)
+        self.cdf_d2[index] = norm_cdf(d2)
+        self.pdf_d1[index] = norm_pdf(d1)
+        # Outputs already requested are patched in place; the others stay lazy
+        for name, values in self._results.items():
+            values[index] = self._compute(name, index)
+
+    def update_spot(self, S, index=slice(None)):
+        """
+        Move the stock price of the selected contracts (all by default).
+        Rate- and volatility-dependent terms are reused unchanged.
+        """
+        self.S[index] = S
+        self.log_S[index] = np.log(self.S[index])
+        self._refresh(index)
+
+    def update_vol(self, sigma, index=slice(None)):
+        """Change the volatility of the selected contracts (all by default)."""
+        self.sigma[index] = sigma
+        self.sigma_sqrt_T[index] = self.sigma[index] * self.sqrt_T[index]
+        self.drift[index] = (self.r[index] + 0.5 * self.sigma[index]**2) * self.T[index]
+        self._refresh(index)
+
+    def update_rate(self, r, index=slice(None)):
+        """Change the interest rate of the selected contracts (all by default)."""
+        self.r[index] = r
+        self.discounted_K[index] = self.K[index] * np.exp(-self.r[index] * self.T[index])
+        self.drift[index] = (self.r[index] + 0.5 * self.sigma[index]**2) * self.T[index]
+        self._refresh(index)
+
+    def _compute(self, name, index=slice(None)):
+        """Evaluate one output for the selected contracts from the cached terms."""
+        S, dK = self.S[index], self.discounted_K[index]
+        cdf_d1, cdf_d2, pdf_d1 = self.cdf_d1[index], self.cdf_d2[index], self.pdf_d1[index]
+        if name == 'call_price':
+            return S * cdf_d1 - dK * cdf_d2
+        if name == 'put_price':
+            return dK * (1 - cdf_d2) - S * (1 - cdf_d1)
+        if name == 'delta_call':
+            return np.array(cdf_d1)
+        if name == 'delta_put':
+            return cdf_d1 - 1
+        if name == 'gamma':
+            return pdf_d1 / (S * self.sigma_sqrt_T[index])
+        if name == 'vega':
+            return S * self.sqrt_T[index] * pdf_d1
+        if name in ('theta_call', 'theta_put'):
+            decay = -(S * pdf_d1 * self.sigma[index]) / (2 * self.sqrt_T[index])
+            if name == 'theta_call':
+                return decay - self.r[index] * dK * cdf_d2
+            return decay + self.r[index] * dK * (1 - cdf_d2)
+        if name == 'rho_call':
+            return self.T[index] * dK * cdf_d2
+        if name == 'rho_put':
+            return -self.T[index] * dK * (1 - cdf_d2)
+        raise KeyError(name)
+
+    def get(self, name):
+        """
+        Return one price or Greek array (see OUTPUTS), computing it from the
+        cached terms on first access. Later updates patch the returned
+        array in place, so copy it to keep a snapshot.
+        """
+        if name not in self._results:
+            self._results[name] = self._compute(name)
+        return self._results[name]
+
+    def price_and_greeks(self, fields=OUTPUTS):
+        """
+        Return the selected prices and Greeks for every contract.
+
+        Returns:
+        dict: Same keys as BlackScholes.price_and_greeks
+        """
+        return {name: self.get(name) for name in fields}
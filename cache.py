@@ -0,0 +1,83 @@
+import threading
+from collections import OrderedDict
+
+class ResultCache:
+    """
+    A bounded, thread-safe LRU cache for pricing results keyed on
+    quantized option parameters.
+    """
+
+    def __init__(self, maxsize=1024, decimals=8):
+        """
+        Initialize an empty cache.
+
+        Parameters:
+        maxsize (int): Maximum number of entries kept; 0 disables caching
+        decimals (int): Number of decimals parameters are rounded to
+        """
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def quantize(self, *params):
+        """
+        Round option parameters to the cache resolution.
+        Callers should price with the quantized values so that every
+        request sharing a key also shares exactly the same result.
+
+        Returns:
+        tuple: The rounded parameters
+        """
+        return tuple(round(float(p), self.decimals) for p in params)
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, calling compute() and storing its
+        result on a miss. The least recently used entry is evicted once the
+        cache is full.
+
+        Parameters:
+        key (hashable): Cache key, normally built from quantized parameters
+        compute (callable): Zero-argument function producing the value
+
+        Returns:
+        The cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock so slow entries don't serialize requests
+        value = compute()
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return the current size, capacity and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
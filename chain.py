@@ -0,0 +1,151 @@
+import numpy as np
+from black_scholes import BlackScholes
+
+# Values of the option_type column
+CALL = 1
+PUT = -1
+
+# Columns stored by an OptionChain, in constructor order
+FLOAT_COLUMNS = ('S', 'K', 'r', 'T', 'sigma')
+
+def _type_codes(option_type):
+    """Convert 'call'/'put' strings or +1/-1 codes to an int8 array."""
+    option_type = np.asarray(option_type)
+    if option_type.dtype.kind in 'UO':
+        if not np.isin(option_type, ('call', 'put')).all():
+            raise ValueError("option_type must be 'call' or 'put'")
+        return np.where(option_type == 'call', CALL, PUT).astype(np.int8)
+    if not np.isin(option_type, (CALL, PUT)).all():
+        raise ValueError('option_type codes must be CALL (1) or PUT (-1)')
+    return option_type.astype(np.int8)
+
+def _column_property(name, doc):
+    def getter(row):
+        return row._chain._columns[name][row._index].item()
+
+    def setter(row, value):
+        row._chain._columns[name][row._index] = value
+    return property(getter, setter, doc=doc)
+
+class OptionRow:
+    """
+    A lightweight proxy for one contract of an OptionChain.
+    Attribute reads and writes go straight to the chain's arrays; no
+    per-contract data is copied.
+    """
+    __slots__ = ('_chain', '_index')
+
+    def __init__(self, chain, index):
+        self._chain = chain
+        self._index = index
+
+    S = _column_property('S', 'Current stock price')
+    K = _column_property('K', 'Strike price')
+    r = _column_property('r', 'Risk-free interest rate')
+    T = _column_property('T', 'Time to maturity in years')
+    sigma = _column_property('sigma', 'Volatility of the underlying asset')
+    option_type = _column_property('option_type', 'CALL (1) or PUT (-1)')
+    quantity = _column_property('quantity', 'Position size')
+
+    def __repr__(self):
+        kind = 'call' if self.option_type == CALL else 'put'
+        return (f'OptionRow(S={self.S}, K={self.K}, r={self.r}, T={self.T}, '
+                f'sigma={self.sigma}, option_type={kind!r}, quantity={self.quantity})')
+
+class OptionChain:
+    """
+    An array-backed (struct-of-arrays) container of option contracts.
+    S, K, r, T, sigma and quantity are contiguous float64 columns and the
+    option type is an int8 column of CALL/PUT codes, so a million contracts
+    take about 49 MB. Slicing returns a zero-copy view; filtering with a
+    boolean mask or index array returns a compact copy. Every BlackScholes
+    pricing and Greek method accepts a chain in place of (S, K, r, T, sigma).
+    """
+
+    def __init__(self, S, K, r, T, sigma, option_type=CALL, quantity=1.0):
+        """
+        Parameters:
+        S, K, r, T, sigma (float or array): Contract inputs, broadcast together
+        option_type (str, int or array): 'call'/'put' or CALL/PUT codes
+        quantity (float or array): Position sizes
+        """
+        arrays = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (S, K, r, T, sigma, quantity)),
+                                     _type_codes(option_type))
+        arrays = [np.ascontiguousarray(np.atleast_1d(a)) for a in arrays]
+        if arrays[0].ndim != 1:
+            raise ValueError('OptionChain columns must be one-dimensional')
+        self._columns = dict(zip(FLOAT_COLUMNS + ('quantity', 'option_type'), arrays))
+
+    @classmethod
+    def _from_columns(cls, columns):
+        chain = cls.__new__(cls)
+        chain._columns = columns
+        return chain
+
+    def __len__(self):
+        return len(self._columns['S'])
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if not -len(self) <= key < len(self):
+                raise IndexError('OptionChain index out of range')
+            return OptionRow(self, int(key) % len(self))
+        # Slices give views; masks and index arrays give copies
+        return self._from_columns({name: column[key] for name, column in self._columns.items()})
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield OptionRow(self, i)
+
+    def __repr__(self):
+        return f'OptionChain({len(self)} contracts)'
+
+    @property
+    def S(self):
+        return self._columns['S']
+
+    @property
+    def K(self):
+        return self._columns['K']
+
+    @property
+    def r(self):
+        return self._columns['r']
+
+    @property
+    def T(self):
+        return self._columns['T']
+
+    @property
+    def sigma(self):
+        return self._columns['sigma']
+
+    @property
+    def option_type(self):
+        return self._columns['option_type']
+
+    @property
+    def quantity(self):
+        return self._columns['quantity']
+
+    @property
+    def nbytes(self):
+        """Total memory held by the columns in bytes."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def pricing_args(self):
+        """Return the (S, K, r, T, sigma) columns accepted by the pricing APIs."""
+        return tuple(self._columns[name] for name in FLOAT_COLUMNS)
+
+    def option_types(self):
+        """Return the option types as an array of 'call'/'put' strings."""
+        return np.where(self.option_type == CALL, 'call', 'put')
+
+    def prices(self):
+        """Price every contract according to its own option type."""
+        results = BlackScholes.price_and_greeks(self)
+        return np.where(self.option_type == CALL, results['call_price'], results['put_price'])
+
+    def market_value(self):
+        """Return the total quantity-weighted value of the chain."""
+        return float(self.quantity @ self.prices())
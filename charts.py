@@ -0,0 +1,105 @@
+import json
+import threading
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+def dumps(obj):
+    """
+    Serialize chart data to a JSON string.
+    Uses orjson with native NumPy support when it is installed and falls
+    back to the Plotly JSON encoder otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    import plotly
+    return json.dumps(obj, cls=plotly.utils.PlotlyJSONEncoder)
+
+def vline(x, y0, y1, color):
+    """Return a dashed vertical marker line shape."""
+    return {
+        'type': 'line',
+        'x0': x, 'y0': y0, 'x1': x, 'y1': y1,
+        'line': {'color': color, 'width': 1, 'dash': 'dash'}
+    }
+
+class FigureTemplate:
+    """
+    A Plotly figure skeleton that is validated and serialized once, then
+    filled with the numeric data for each request. Plotly is only imported
+    when the first template is built, so code paths that never render a
+    chart never pay for it.
+    """
+
+    def __init__(self, traces, trace_type='Scatter', **layout):
+        """
+        Record the skeleton; it is built through Plotly on first use (or
+        by build()), so its validators and default theme are applied
+        exactly as for a regular go.Figure.
+
+        Parameters:
+        traces (list): Keyword dicts for the traces, without their data
+        trace_type (str): Plotly trace class, e.g. 'Scatter' or 'Heatmap'
+        **layout: Keyword arguments for the figure layout
+        """
+        self._spec = (traces, trace_type, layout)
+        self._lock = threading.Lock()
+        self.traces = None
+        self._layout_json = None
+
+    def build(self):
+        """Validate and serialize the skeleton through Plotly, if not done already."""
+        with self._lock:
+            if self.traces is not None:
+                return self
+            import plotly.graph_objects as go
+            import plotly.io as pio
+            traces, trace_type, layout = self._spec
+            fig = go.Figure(layout=layout)
+            for trace in traces:
+                fig.add_trace(getattr(go, trace_type)(**trace))
+            spec = json.loads(pio.to_json(fig))
+            # Pre-serialized layout; per-request shapes are spliced in front
+            self._layout_json = dumps(spec['layout'])
+            self.traces = spec['data']
+        return self
+
+    def render(self, x, ys, shapes=()):
+        """
+        Produce the figure JSON for one set of curves.
+
+        Parameters:
+        x (array or list): Shared x values, or one array per trace
+        ys (list): One array of y values per trace
+        shapes (list): Layout shapes such as vline markers
+
+        Returns:
+        str: Figure JSON with 'data' and 'layout' keys
+        """
+        xs = x if isinstance(x, (list, tuple)) else [x] * len(ys)
+        return self._figure([(x_, y_) for x_, y_ in zip(xs, ys)], shapes)
+
+    def render_heatmap(self, x, y, z, shapes=(), **trace):
+        """
+        Produce the figure JSON for a template with a single heatmap trace.
+
+        Parameters:
+        x, y (array): Column and row coordinates
+        z (2-D array): Values, one row per y
+        shapes (list): Layout shapes such as vline markers
+        **trace: Per-request trace attributes, e.g. a colorbar title
+
+        Returns:
+        str: Figure JSON with 'data' and 'layout' keys
+        """
+        return self._figure([(x, y)], shapes, z=z, **trace)
+
+    def _figure(self, series, shapes, **trace):
+        if self.traces is None:
+            self.build()
+        data = [dict(template, x=x, y=y, **trace) for template, (x, y) in zip(self.traces, series)]
+        return ('{"data":' + dumps(data)
+                + ',"layout":{"shapes":' + dumps(list(shapes)) + ','
+                + self._layout_json[1:] + '}')
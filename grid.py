@@ -0,0 +1,211 @@
+import json
+import time
+import numpy as np
+from black_scholes import BlackScholes
+
+# Fields stored in the grid, in table order
+FIELDS = ('call_price', 'put_price', 'delta_call', 'delta_put', 'gamma', 'vega',
+          'theta_call', 'theta_put', 'rho_call', 'rho_put')
+
+# Power of K each field scales with when the grid is stored for K = 1
+# (prices and most Greeks are homogeneous of degree 1 in (S, K))
+K_SCALING = {'call_price': 1, 'put_price': 1, 'delta_call': 0, 'delta_put': 0, 'gamma': -1,
+             'vega': 1, 'theta_call': 1, 'theta_put': 1, 'rho_call': 1, 'rho_put': 1}
+
+class PriceGrid:
+    """
+    A dense table of Black-Scholes prices and Greeks over moneyness (S/K),
+    time to maturity and volatility for a fixed interest rate.
+
+    Values are stored for K = 1 on uniform axes and scaled back by the
+    homogeneity of the formula, so one grid serves every strike. Lookups
+    interpolate within the grid and fall back to the exact formula outside it.
+
+    Error bound: for multilinear interpolation of a smooth field f on a cell
+    with spacings (h_m, h_T, h_s), the error is at most
+        (h_m^2 |f_mm| + h_T^2 |f_TT| + h_s^2 |f_ss|) / 8
+    error_bound() evaluates this per field using second differences of the
+    table in place of the derivatives. It is loosest near expiry at the
+    money, where the payoff kink makes the derivatives large.
+
+    Lookups are slower than BlackScholes.price_and_greeks itself, so the
+    request handlers keep using the closed form.
+    """
+
+    def __init__(self, r, axes, table, build_seconds=0.0):
+        """
+        Parameters:
+        r (float): Risk-free interest rate the grid was built for
+        axes (tuple): (moneyness, maturity, volatility) as (start, stop, num) tuples
+        table (ndarray): Array of shape (n_m, n_T, n_s, len(FIELDS)); fields
+                         are the last axis so one gather fetches a whole record
+        build_seconds (float): Time taken to build the table
+        """
+        self.r = r
+        self.axes = tuple(tuple(axis) for axis in axes)
+        self.table = table
+        self.build_seconds = build_seconds
+        self.max_observed_error = None
+        self._starts = np.array([a[0] for a in self.axes])
+        self._stops = np.array([a[1] for a in self.axes])
+        self._sizes = np.array([a[2] for a in self.axes])
+        self._steps = (self._stops - self._starts) / (self._sizes - 1)
+
+    @classmethod
+    def build(cls, r, moneyness=(0.5, 1.5, 101), maturity=(0.05, 2.0, 79), volatility=(0.05, 0.8, 76)):
+        """
+        Compute a grid with one vectorized BlackScholes call.
+
+        Parameters:
+        r (float): Risk-free interest rate
+        moneyness (tuple): (start, stop, num) for S/K
+        maturity (tuple): (start, stop, num) for T in years
+        volatility (tuple): (start, stop, num) for sigma
+
+        Returns:
+        PriceGrid: The built grid, with build_seconds recorded
+        """
+        start = time.perf_counter()
+        m, T, sigma = (np.linspace(*axis)[index] for axis, index in zip(
+            (moneyness, maturity, volatility),
+            (np.s_[:, None, None], np.s_[None, :, None], np.s_[None, None, :])))
+        results = BlackScholes.surface(m, 1.0, r, T, sigma)
+        table = np.stack([results[name] for name in FIELDS], axis=-1)
+        return cls(r, (moneyness, maturity, volatility), table, time.perf_counter() - start)
+
+    @property
+    def nbytes(self):
+        """Memory footprint of the table in bytes."""
+        return self.table.nbytes
+
+    def _inside(self, points):
+        return np.all((points >= self._starts) & (points <= self._stops), axis=-1)
+
+    def _interpolate_linear(self, points, fields):
+        # Cell index and fractional position along each axis
+        position = (points - self._starts) / self._steps
+        index = np.clip(np.floor(position).astype(np.intp), 0, self._sizes - 2)
+        frac = position - index
+        n_T, n_s = self.table.shape[1:3]
+        base = (index[:, 0] * n_T + index[:, 1]) * n_s + index[:, 2]
+        flat = self.table.reshape(-1, len(FIELDS))
+        columns = [FIELDS.index(name) for name in fields]
+
+        # Accumulate the 8 cell corners, each weighted by its opposite volume
+        weights = [(1 - frac[:, axis], frac[:, axis]) for axis in range(3)]
+        total = 0.0
+        for a, b, c in np.ndindex(2, 2, 2):
+            offset = (a * n_T + b) * n_s + c
+            weight = weights[0][a] * weights[1][b] * weights[2][c]
+            total = total + weight[:, None] * flat.take(base + offset, axis=0)[:, columns]
+        return dict(zip(fields, total.T))
+
+    def _interpolate_cubic(self, points, fields):
+        from scipy.interpolate import RegularGridInterpolator
+        grid_axes = tuple(np.linspace(*axis) for axis in self.axes)
+        return {name: RegularGridInterpolator(grid_axes, self.table[..., FIELDS.index(name)],
+                                              method='cubic')(points)
+                for name in fields}
+
+    def lookup(self, S, K, T, sigma, fields=FIELDS, method='linear'):
+        """
+        Look up prices and Greeks, interpolating inside the grid and using
+        the exact formula for points outside it.
+
+        Parameters:
+        S, K, T, sigma (float or array): Contract inputs; r is the grid's rate
+        fields (tuple): Names of the outputs to return
+        method (str): 'linear' (multilinear) or 'cubic'
+
+        Returns:
+        dict: Field name -> ndarray in the broadcast shape of the inputs
+        """
+        S, K, T, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, sigma)))
+        shape = S.shape
+        S, K, T, sigma = (a.reshape(-1) for a in (S, K, T, sigma))
+        points = np.column_stack([S / K, T, sigma])
+        inside = self._inside(points)
+
+        interpolate = self._interpolate_cubic if method == 'cubic' else self._interpolate_linear
+        approx = interpolate(points[inside], fields)
+        outside = ~inside
+        exact = BlackScholes.price_and_greeks(S[outside], K[outside], self.r, T[outside], sigma[outside])
+
+        results = {}
+        for name in fields:
+            values = np.empty(len(S))
+            values[inside] = approx[name] * K[inside] ** K_SCALING[name]
+            values[outside] = exact[name]
+            results[name] = values.reshape(shape)
+        return results
+
+    def error_bound(self):
+        """
+        Estimate the worst-case multilinear interpolation error of each
+        field for K = 1, from second differences of the table.
+
+        Returns:
+        dict: Field name -> bound (scale by K ** K_SCALING for other strikes)
+        """
+        bounds = {}
+        for f, name in enumerate(FIELDS):
+            t = self.table[..., f]
+            total = 0.0
+            for axis in range(3):
+                second = np.abs(np.diff(t, n=2, axis=axis))
+                total += second.max() / 8
+            bounds[name] = float(total)
+        return bounds
+
+    def measure_error(self, samples=100000, method='linear', seed=0):
+        """
+        Compare interpolated values against the exact formula at random
+        points inside the grid (K = 1) and record the maximum error.
+
+        Returns:
+        dict: Field name -> maximum absolute error observed
+        """
+        rng = np.random.default_rng(seed)
+        m, T, sigma = (rng.uniform(start, stop, samples) for start, stop, _ in self.axes)
+        approx = self.lookup(m, 1.0, T, sigma, method=method)
+        exact = BlackScholes.price_and_greeks(m, 1.0, self.r, T, sigma)
+        self.max_observed_error = {name: float(np.max(np.abs(approx[name] - exact[name])))
+                                   for name in FIELDS}
+        return self.max_observed_error
+
+    def info(self):
+        """Report grid shape, build time, memory footprint and observed error."""
+        return {
+            'r': self.r,
+            'axes': {'moneyness': self.axes[0], 'maturity': self.axes[1], 'volatility': self.axes[2]},
+            'build_seconds': self.build_seconds,
+            'nbytes': self.nbytes,
+            'max_observed_error': self.max_observed_error
+        }
+
+    def save(self, path):
+        """
+        Save the table as an .npy file with its metadata alongside in
+        path + '.json'. Loading with mmap=True lets processes share it.
+        """
+        if not path.endswith('.npy'):
+            path += '.npy'
+        np.save(path, self.table)
+        with open(path + '.json', 'w') as f:
+            json.dump({'r': self.r, 'axes': self.axes, 'build_seconds': self.build_seconds,
+                       'max_observed_error': self.max_observed_error}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a grid written by save(). With mmap the table is memory-mapped
+        read-only, so every process loading it shares the same pages.
+        """
+        if not path.endswith('.npy'):
+            path += '.npy'
+        with open(path + '.json') as f:
+            meta = json.load(f)
+        grid = cls(meta['r'], meta['axes'], np.load(path, mmap_mode='r' if mmap else None),
+                   meta['build_seconds'])
+        grid.max_observed_error = meta['max_observed_error']
+        return grid
@@ -0,0 +1,16 @@
+"""
+Gunicorn settings, picked up automatically by `gunicorn app:app`.
+
+Set GUNICORN_PRELOAD=1 to import the app once in the master process and
+warm it up before the workers are forked. Workers then start ready to
+serve and share the loaded modules and chart templates copy-on-write.
+"""
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '0') == '1'
+
+def when_ready(server):
+    # With preload_app the app is already imported here, before any worker is forked
+    if server.cfg.preload_app:
+        import app
+        app.warm_up()
@@ -0,0 +1,131 @@
+import math
+import numpy as np
+from black_scholes import BlackScholes
+from cache import ResultCache
+
+# Lattice points along each side of a tile
+TILE_SIZE = 64
+
+# Order of the pricing arguments
+PARAMS = ('S', 'K', 'r', 'T', 'sigma')
+
+# Heatmap layouts: name -> (x parameter, y parameter); the others are held fixed
+AXES = {
+    'spot_vol': ('S', 'sigma'),
+    'spot_time': ('S', 'T')
+}
+
+# Values a heatmap can show, as returned by BlackScholes.price_and_greeks
+QUANTITIES = ('call_price', 'put_price', 'delta_call', 'delta_put', 'gamma', 'vega',
+              'theta_call', 'theta_put', 'rho_call', 'rho_put')
+
+def lattice_step(lo, hi, points):
+    """
+    Return the largest power-of-two step that still samples [lo, hi] with
+    at least the given number of points. Snapping steps to powers of two
+    keeps the lattice, and so its tiles, identical across requests whose
+    ranges differ only slightly, and a 2x zoom lands on the next level.
+    """
+    return 2.0 ** math.floor(math.log2((hi - lo) / points))
+
+def downsample(values, points):
+    """Return the indices of at most `points` evenly spread entries of values."""
+    if len(values) <= points:
+        return np.arange(len(values))
+    return np.round(np.linspace(0, len(values) - 1, points)).astype(np.intp)
+
+class HeatmapTiler:
+    """
+    Computes 2-D price/Greek grids as fixed-size tiles of a global lattice.
+
+    Each axis is sampled at integer multiples of a power-of-two step, and
+    the lattice is cut into TILE_SIZE x TILE_SIZE tiles, each priced by one
+    broadcast call. Tiles are cached by their layout, quantity, fixed
+    parameters, steps and position. Panning therefore only prices the
+    tiles that come into view, and zooming in or out by a factor of two
+    reuses a neighbouring level. Tiles are stored as float32.
+    """
+
+    def __init__(self, cache=None, tile_size=TILE_SIZE, pricer=BlackScholes.price_and_greeks):
+        """
+        Parameters:
+        cache (ResultCache): Tile cache (default: a private one of 1024 tiles)
+        tile_size (int): Lattice points along each side of a tile
+        pricer (callable): (S, K, r, T, sigma) -> price_and_greeks style dict
+        """
+        self.cache = ResultCache(1024) if cache is None else cache
+        self.tile_size = tile_size
+        self.pricer = pricer
+
+    def tile(self, axes, quantity, fixed, steps, index):
+        """
+        Return one tile as a (tile_size, tile_size) float32 array of y rows
+        by x columns; lattice points with a non-positive coordinate are NaN.
+
+        Parameters:
+        axes (str): Key of AXES
+        quantity (str): One of QUANTITIES
+        fixed (tuple): Values of the three parameters not on an axis, in PARAMS order
+        steps (tuple): (x step, y step) of the lattice
+        index (tuple): (x, y) position of the tile in the lattice
+        """
+        key = ('tile', axes, quantity, fixed, steps, index, self.tile_size)
+        return self.cache.get_or_compute(key, lambda: self._compute(axes, quantity, fixed, steps, index))
+
+    def _compute(self, axes, quantity, fixed, steps, index):
+        n = self.tile_size
+        x_name, y_name = AXES[axes]
+        x, y = ((i * n + np.arange(n)) * step for i, step in zip(index, steps))
+        args = dict(zip((p for p in PARAMS if p not in AXES[axes]), fixed))
+        args[x_name] = x[None, :]
+        args[y_name] = y[:, None]
+        with np.errstate(all='ignore'):
+            values = self.pricer(*(args[p] for p in PARAMS))[quantity]
+        values = np.broadcast_to(values, (n, n)).astype(np.float32)
+        values[:, x <= 0] = np.nan
+        values[y <= 0] = np.nan
+        # Tiles are shared between requests through the cache, so freeze them
+        values.flags.writeable = False
+        return values
+
+    def grid(self, axes, quantity, fixed, x_range, y_range, resolution):
+        """
+        Evaluate a quantity over a rectangle of the two axis parameters.
+
+        The rectangle is sampled on the finest lattice level giving at
+        least `resolution` points per axis, assembled from cached tiles and
+        then downsampled to at most `resolution` points per axis, so the
+        output size is bounded by resolution squared whatever the zoom.
+
+        Parameters:
+        axes (str): Key of AXES
+        quantity (str): One of QUANTITIES
+        fixed (tuple): Values of the parameters not on an axis, in PARAMS order
+        x_range, y_range (tuple): (min, max) of each axis parameter
+        resolution (int): Maximum points per axis in the result
+
+        Returns:
+        tuple: (x, y, z) with z a float32 array of shape (len(y), len(x))
+        """
+        n = self.tile_size
+        steps = tuple(lattice_step(lo, hi, resolution) for lo, hi in (x_range, y_range))
+        for (lo, hi), step in zip((x_range, y_range), steps):
+            if max(abs(lo), abs(hi)) / step > 2**40:
+                raise ValueError('heatmap range is too narrow for its magnitude')
+        # Lattice indices inside each range and the tiles covering them
+        (x0, x1), (y0, y1) = ((math.ceil(lo / step), math.floor(hi / step))
+                              for (lo, hi), step in zip((x_range, y_range), steps))
+        tiles_x = range(x0 // n, x1 // n + 1)
+        tiles_y = range(y0 // n, y1 // n + 1)
+
+        z = np.empty((len(tiles_y) * n, len(tiles_x) * n), dtype=np.float32)
+        for j, ty in enumerate(tiles_y):
+            for i, tx in enumerate(tiles_x):
+                z[j * n:(j + 1) * n, i * n:(i + 1) * n] = self.tile(axes, quantity, fixed, steps, (tx, ty))
+        z = z[y0 - tiles_y.start * n:y1 - tiles_y.start * n + 1,
+              x0 - tiles_x.start * n:x1 - tiles_x.start * n + 1]
+        x = np.arange(x0, x1 + 1) * steps[0]
+        y = np.arange(y0, y1 + 1) * steps[1]
+
+        keep_x, keep_y = downsample(x, resolution), downsample(y, resolution)
+        return x[keep_x], y[keep_y], z[np.ix_(keep_y, keep_x)]
@@ -0,0 +1,86 @@
+"""
+Optional Numba-compiled Black-Scholes kernel.
+
+price_and_greeks here computes every output for a contract in one fused,
+multi-threaded loop: d1, d2 and the normal terms stay in registers and
+no intermediate arrays are allocated. Numba is detected at import
+without importing it, since importing Numba is slow. The kernel is
+compiled on first use and cached on disk, and BlackScholes falls back
+to NumPy when Numba is not installed.
+"""
+import importlib.util
+import math
+import numpy as np
+
+# Whether Numba is installed
+AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# Arrays smaller than this are left to NumPy; thread start-up dominates below it
+MIN_SIZE = 20000
+
+# Output rows of the kernel, matching BlackScholes.price_and_greeks
+OUTPUTS = ('call_price', 'put_price', 'delta_call', 'delta_put', 'gamma', 'vega',
+           'theta_call', 'theta_put', 'rho_call', 'rho_put')
+
+# Fast-math flags that allow reassociation and fused multiply-adds but keep
+# IEEE NaN/inf semantics, so invalid inputs still produce NaN as with NumPy
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+_kernel = None
+
+def _compile():
+    import numba
+
+    inv_sqrt_2pi = 1 / math.sqrt(2 * math.pi)
+    inv_sqrt_2 = 1 / math.sqrt(2)
+
+    @numba.njit(parallel=True, fastmath=FASTMATH, cache=True)
+    def kernel(S, K, r, T, sigma, out):
+        for i in numba.prange(S.shape[0]):
+            # Widened to float64, so float32 arrays are only rounded on store
+            s, k, rate, t, vol = (np.float64(S[i]), np.float64(K[i]), np.float64(r[i]),
+                                  np.float64(T[i]), np.float64(sigma[i]))
+            sqrt_t = math.sqrt(t)
+            vol_sqrt_t = vol * sqrt_t
+            d1 = (math.log(s / k) + (rate + 0.5 * vol * vol) * t) / vol_sqrt_t
+            d2 = d1 - vol_sqrt_t
+            discounted_k = k * math.exp(-rate * t)
+
+            # Same erfc form as scipy.special.ndtr
+            cdf_d1 = 0.5 * math.erfc(-d1 * inv_sqrt_2)
+            cdf_d2 = 0.5 * math.erfc(-d2 * inv_sqrt_2)
+            pdf_d1 = inv_sqrt_2pi * math.exp(-0.5 * d1 * d1)
+            cdf_neg_d2 = 1 - cdf_d2
+
+            decay = -(s * pdf_d1 * vol) / (2 * sqrt_t)
+            out[0, i] = s * cdf_d1 - discounted_k * cdf_d2
+            out[1, i] = discounted_k * cdf_neg_d2 - s * (1 - cdf_d1)
+            out[2, i] = cdf_d1
+            out[3, i] = cdf_d1 - 1
+            out[4, i] = pdf_d1 / (s * vol_sqrt_t)
+            out[5, i] = s * sqrt_t * pdf_d1
+            out[6, i] = decay - rate * discounted_k * cdf_d2
+            out[7, i] = decay + rate * discounted_k * cdf_neg_d2
+            out[8, i] = t * discounted_k * cdf_d2
+            out[9, i] = -t * discounted_k * cdf_neg_d2
+    return kernel
+
+def price_and_greeks(S, K, r, T, sigma, dtype=np.float64):
+    """
+    Compiled equivalent of BlackScholes.price_and_greeks. With float32 the
+    inputs and outputs are float32 (a separate compiled specialization)
+    while every intermediate is float64, so outputs are rounded only once.
+
+    Returns:
+    dict: Same keys as BlackScholes.price_and_greeks, each an ndarray in
+          the broadcast shape of the inputs
+    """
+    global _kernel
+    if _kernel is None:
+        _kernel = _compile()
+    arrays = np.broadcast_arrays(*(np.asarray(x, dtype=dtype) for x in (S, K, r, T, sigma)))
+    shape = arrays[0].shape
+    flat = [np.ascontiguousarray(a).reshape(-1) for a in arrays]
+    out = np.empty((len(OUTPUTS), flat[0].size), dtype=dtype)
+    _kernel(*flat, out)
+    return {name: out[i].reshape(shape) for i, name in enumerate(OUTPUTS)}
@@ -0,0 +1,180 @@
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+
+# Histogram bucket upper bounds in seconds, from 50 µs to 5 s
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Shared no-op returned by Metrics.timer when instrumentation is off
+NULL_TIMER = nullcontext()
+
+class Histogram:
+    """Fixed-bucket latency histogram; counts are stored per bucket, not cumulatively."""
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * (size + 1)  # Last slot is the +Inf bucket
+        self.sum = 0.0
+        self.count = 0
+
+class _Timer:
+    __slots__ = ('_metrics', '_key', '_start')
+
+    def __init__(self, metrics, key):
+        self._metrics = metrics
+        self._key = key
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics.observe(*self._key, time.perf_counter() - self._start)
+
+class Metrics:
+    """
+    Per-route, per-stage latency histograms and request counters, rendered
+    in the Prometheus text exposition format. When disabled, timer() hands
+    back a shared no-op context manager and nothing is recorded.
+    """
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS, prefix='bs'):
+        """
+        Parameters:
+        enabled (bool): Whether anything is recorded
+        buckets (tuple): Ascending histogram upper bounds in seconds
+        prefix (str): Prefix for every exported metric name
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._histograms = {}
+        self._requests = Counter()
+        self._lock = threading.Lock()
+
+    def timer(self, route, stage):
+        """Return a context manager that records the time spent in one stage of a route."""
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, (route, stage))
+
+    def observe(self, route, stage, seconds):
+        """Record one stage duration in seconds."""
+        if not self.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get((route, stage))
+            if histogram is None:
+                histogram = self._histograms[route, stage] = Histogram(len(self.buckets))
+            histogram.counts[index] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+
+    def count_request(self, route, status):
+        """Count one completed request by route and status code."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._requests[route, status] += 1
+
+    def clear(self):
+        """Drop every recorded observation."""
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+    def render(self, extra=()):
+        """
+        Render all metrics in the Prometheus text format.
+
+        Parameters:
+        extra (iterable): (name, type, help, value) tuples for additional
+                          unlabelled metrics, e.g. cache counters
+
+        Returns:
+        str: The exposition text
+        """
+        with self._lock:
+            histograms = {key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()}
+            requests = dict(self._requests)
+
+        name = f'{self.prefix}_stage_seconds'
+        lines = [f'# HELP {name} Time spent in each stage of a request',
+                 f'# TYPE {name} histogram']
+        bounds = [repr(b) for b in self.buckets] + ['+Inf']
+        for (route, stage), (counts, total, count) in sorted(histograms.items()):
+            labels = f'route="{route}",stage="{stage}"'
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {total!r}')
+            lines.append(f'{name}_count{{{labels}}} {count}')
+
+        name = f'{self.prefix}_requests_total'
+        lines += [f'# HELP {name} Completed requests by route and status code',
+                  f'# TYPE {name} counter']
+        for (route, status), count in sorted(requests.items()):
+            lines.append(f'{name}{{route="{route}",status="{status}"}} {count}')
+
+        for metric, kind, help_text, value in extra:
+            metric = f'{self.prefix}_{metric}'
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}', f'{metric} {value!r}']
+        return '\n'.join(lines) + '\n'
+
+class SamplingProfiler:
+    """
+    A minimal statistical profiler. A background thread samples the stack
+    of one target thread at a fixed interval and counts each distinct
+    stack, producing folded-stack output for flame graph tools
+    (flamegraph.pl, speedscope).
+    """
+
+    def __init__(self, interval_ms=1.0, thread_id=None):
+        """
+        Parameters:
+        interval_ms (float): Time between samples
+        thread_id (int): Thread to sample (default: the calling thread)
+        """
+        self.interval = interval_ms / 1000
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def folded(self):
+        """Return the samples as folded stacks, one 'frame;frame;... count' line each."""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -1,5 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
 from black_scholes import BlackScholes
 
 class OptionVisualizer:
@@ -26,8 +25,9 @@ class OptionVisualizer:
         
     def calculate_option_prices(self):
         """Calculate and display option prices with current parameters."""
-        call = BlackScholes.call_price(self.S0, self.K, self.r, self.T, self.sigma)
-        put = BlackScholes.put_price(self.S0, self.K, self.r, self.T, self.sigma)
+        results = BlackScholes.price_and_greeks(self.S0, self.K, self.r, self.T, self.sigma)
+        call = results['call_price']
+        put = results['put_price']
         
         print(f"Option Parameters:")
         print(f"  Stock Price (S0): {self.S0}")
@@ -39,11 +39,13 @@ class OptionVisualizer:
         print(f"  Call option price: ${call:.2f}")
         print(f"  Put option price: ${put:.2f}")
         
-    def plot_price_vs_stock_price(self):
+    def plot_price_vs_stock_price(self, num_points=100):
         """Plot option price vs stock price."""
-        S_values = np.linspace(self.K/2, self.K*1.5, 100)
-        call_prices = [BlackScholes.call_price(S, self.K, self.r, self.T, self.sigma) for S in S_values]
-        put_prices = [BlackScholes.put_price(S, self.K, self.r, self.T, self.sigma) for S in S_values]
+        import matplotlib.pyplot as plt  # Imported on first plot; slow to load
+        S_values = np.linspace(self.K/2, self.K*1.5, num_points)
+        curves = BlackScholes.surface(S_values, self.K, self.r, self.T, self.sigma)
+        call_prices = curves['call_price']
+        put_prices = curves['put_price']
         
         plt.figure(figsize=(12, 6))
         plt.plot(S_values, call_prices, 'b-', label='Call Option Price')
@@ -56,11 +58,13 @@ class OptionVisualizer:
         plt.grid(True)
         plt.show()
         
-    def plot_price_vs_volatility(self):
+    def plot_price_vs_volatility(self, num_points=100):
         """Plot option price vs volatility."""
-        sigma_values = np.linspace(0.01, 0.5, 100)
-        call_prices = [BlackScholes.call_price(self.S0, self.K, self.r, self.T, vol) for vol in sigma_values]
-        put_prices = [BlackScholes.put_price(self.S0, self.K, self.r, self.T, vol) for vol in sigma_values]
+        import matplotlib.pyplot as plt
+        sigma_values = np.linspace(0.01, 0.5, num_points)
+        curves = BlackScholes.surface(self.S0, self.K, self.r, self.T, sigma_values)
+        call_prices = curves['call_price']
+        put_prices = curves['put_price']
         
         plt.figure(figsize=(12, 6))
         plt.plot(sigma_values, call_prices, 'b-', label='Call Option Price')
@@ -73,16 +77,18 @@ class OptionVisualizer:
         plt.grid(True)
         plt.show()
         
-    def plot_greeks_vs_stock_price(self):
+    def plot_greeks_vs_stock_price(self, num_points=100):
         """Plot option Greeks vs stock price."""
-        S_values = np.linspace(self.K*0.5, self.K*1.5, 100)
+        import matplotlib.pyplot as plt
+        S_values = np.linspace(self.K*0.5, self.K*1.5, num_points)
         
         # Calculate Greeks for call options
-        delta_call = [BlackScholes.delta_call(S, self.K, self.r, self.T, self.sigma) for S in S_values]
-        gamma = [BlackScholes.gamma(S, self.K, self.r, self.T, self.sigma) for S in S_values]
-        vega = [BlackScholes.vega(S, self.K, self.r, self.T, self.sigma) / 100 for S in S_values]  # Scaled for better visibility
-        theta_call = [BlackScholes.theta_call(S, self.K, self.r, self.T, self.sigma) / 365 for S in S_values]  # Daily theta
-        rho_call = [BlackScholes.rho_call(S, self.K, self.r, self.T, self.sigma) / 100 for S in S_values]  # Scaled for better visibility
+        curves = BlackScholes.surface(S_values, self.K, self.r, self.T, self.sigma)
+        delta_call = curves['delta_call']
+        gamma = curves['gamma']
+        vega = curves['vega'] / 100  # Scaled for better visibility
+        theta_call = curves['theta_call'] / 365  # Daily theta
+        rho_call = curves['rho_call'] / 100  # Scaled for better visibility
         
         plt.figure(figsize=(14, 8))
         plt.plot(S_values, delta_call, 'b-', label='Delta')
@@ -99,16 +105,18 @@ class OptionVisualizer:
         plt.grid(True)
         plt.show()
         
-    def plot_greeks_vs_volatility(self):
+    def plot_greeks_vs_volatility(self, num_points=100):
         """Plot option Greeks vs volatility."""
-        sigma_values = np.linspace(0.05, 0.5, 100)
+        import matplotlib.pyplot as plt
+        sigma_values = np.linspace(0.05, 0.5, num_points)
         
         # Calculate Greeks for different volatilities
-        delta_vol = [BlackScholes.delta_call(self.S0, self.K, self.r, self.T, vol) for vol in sigma_values]
-        gamma_vol = [BlackScholes.gamma(self.S0, self.K, self.r, self.T, vol) for vol in sigma_values]
-        vega_vol = [BlackScholes.vega(self.S0, self.K, self.r, self.T, vol) / 100 for vol in sigma_values]  # Scaled
-        theta_vol = [BlackScholes.theta_call(self.S0, self.K, self.r, self.T, vol) / 365 for vol in sigma_values]  # Daily
-        rho_vol = [BlackScholes.rho_call(self.S0, self.K, self.r, self.T, vol) / 100 for vol in sigma_values]  # Scaled
+        curves = BlackScholes.surface(self.S0, self.K, self.r, self.T, sigma_values)
+        delta_vol = curves['delta_call']
+        gamma_vol = curves['gamma']
+        vega_vol = curves['vega'] / 100  # Scaled
+        theta_vol = curves['theta_call'] / 365  # Daily
+        rho_vol = curves['rho_call'] / 100  # Scaled
         
         plt.figure(figsize=(14, 8))
         plt.plot(sigma_values, delta_vol, 'b-', label='Delta')
@@ -124,13 +132,13 @@ class OptionVisualizer:
         plt.grid(True)
         plt.show()
         
-    def plot_all(self):
+    def plot_all(self, num_points=100):
         """Generate all plots."""
         self.calculate_option_prices()
-        self.plot_price_vs_stock_price()
-        self.plot_price_vs_volatility()
-        self.plot_greeks_vs_stock_price()
-        self.plot_greeks_vs_volatility()
+        self.plot_price_vs_stock_price(num_points)
+        self.plot_price_vs_volatility(num_points)
+        self.plot_greeks_vs_stock_price(num_points)
+        self.plot_greeks_vs_volatility(num_points)
 
 
 def main():
@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+import black_scholes
+from black_scholes import BlackScholes
+
+# Order of the result rows in the shared output block
+OUTPUTS = ('call_price', 'put_price', 'delta_call', 'delta_put', 'gamma', 'vega',
+           'theta_call', 'theta_put', 'rho_call', 'rho_put')
+
+def _init_worker():
+    # The processes are the parallelism; a Numba thread pool in every
+    # worker would only oversubscribe the cores
+    black_scholes.set_kernel_backend('numpy')
+
+def _price_slice(input_name, output_name, n, start, stop):
+    """
+    Worker task: price contracts [start, stop) of the shared input block
+    and write the results into the shared output block in place.
+    """
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    try:
+        inputs = np.ndarray((5, n), dtype=np.float64, buffer=input_shm.buf)
+        outputs = np.ndarray((len(OUTPUTS), n), dtype=np.float64, buffer=output_shm.buf)
+        results = BlackScholes.price_and_greeks(*inputs[:, start:stop])
+        for i, name in enumerate(OUTPUTS):
+            outputs[i, start:stop] = results[name]
+        # Release the views before closing the shared memory they point into
+        del inputs, outputs, results
+    finally:
+        input_shm.close()
+        output_shm.close()
+    return stop - start
+
+class ParallelPricer:
+    """
+    Prices large arrays of contracts across a pool of worker processes.
+    Inputs and outputs live in shared memory blocks, so workers only
+    receive block names and slice bounds and nothing else is pickled.
+    Results are written in place, which keeps them in input order.
+    """
+
+    def __init__(self, workers=None, chunk_size=250000):
+        """
+        Parameters:
+        workers (int): Number of worker processes (default: CPU count)
+        chunk_size (int): Contracts priced per task; arrays no larger than
+                          this are priced in the calling process
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            # Spawned rather than forked: forking a process whose Numba
+            # threads are running leaves their locks held in the children
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_worker)
+        return self._executor
+
+    def price_and_greeks(self, S, K=None, r=None, T=None, sigma=None):
+        """
+        Calculate call/put prices and all Greeks, sharded across the pool.
+        Takes the same arguments (or an OptionChain) and returns the same
+        dict as BlackScholes.price_and_greeks, with arrays in the broadcast shape.
+        """
+        if hasattr(S, 'pricing_args'):
+            S, K, r, T, sigma = S.pricing_args()
+        arrays = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (S, K, r, T, sigma)))
+        shape = arrays[0].shape
+        n = arrays[0].size
+        if n <= self.chunk_size or self.workers == 1:
+            return BlackScholes.price_and_greeks(*arrays)
+
+        input_shm = shared_memory.SharedMemory(create=True, size=5 * n * 8)
+        output_shm = shared_memory.SharedMemory(create=True, size=len(OUTPUTS) * n * 8)
+        try:
+            inputs = np.ndarray((5, n), dtype=np.float64, buffer=input_shm.buf)
+            for row, array in zip(inputs, arrays):
+                row[:] = array.reshape(-1)
+            del inputs
+
+            pool = self._pool()
+            tasks = [pool.submit(_price_slice, input_shm.name, output_shm.name, n, start,
+                                 min(start + self.chunk_size, n))
+                     for start in range(0, n, self.chunk_size)]
+            for task in tasks:
+                task.result()
+
+            outputs = np.ndarray((len(OUTPUTS), n), dtype=np.float64, buffer=output_shm.buf)
+            results = {name: outputs[i].reshape(shape).copy() for i, name in enumerate(OUTPUTS)}
+            del outputs
+            return results
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,260 @@
+"""
+Streaming portfolio pricer.
+
+Reads option contracts from a CSV or Parquet file in fixed-size chunks,
+prices each chunk in one vectorized BlackScholes call and streams the
+results to the output file, so memory use is bounded by the chunk size
+rather than the file size.
+
+Example:
+    python portfolio.py positions.csv priced.csv --columns S=spot,K=strike \\
+        --greeks delta_call,gamma,vega
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+import numpy as np
+from black_scholes import BlackScholes
+from parallel import ParallelPricer
+
+# Model inputs and the input column each is read from by default
+INPUTS = ('S', 'K', 'r', 'T', 'sigma')
+
+PRICES = ('call_price', 'put_price')
+GREEKS = ('delta_call', 'delta_put', 'gamma', 'vega', 'theta_call', 'theta_put', 'rho_call', 'rho_put')
+
+def file_format(path, override=None):
+    """Return 'csv' or 'parquet' from an explicit override or the file extension."""
+    if override:
+        return override
+    return 'parquet' if os.path.splitext(path)[1].lower() in ('.parquet', '.pq') else 'csv'
+
+def _to_float(values):
+    """Convert a column of strings or numbers to float64, mapping bad entries to NaN."""
+    try:
+        return np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        out = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+def _as_list(values):
+    """Convert a NumPy array, Arrow array or sequence to a plain list."""
+    if hasattr(values, 'to_pylist'):
+        return values.to_pylist()
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return values
+
+def read_csv_chunks(path, chunk_size):
+    """
+    Yield (header, columns) for consecutive chunks of a CSV file.
+    columns maps every header name to a tuple of the raw string values.
+    """
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+            yield header, dict(zip(header, zip(*rows)))
+
+def read_parquet_chunks(path, chunk_size):
+    """Yield (header, columns) for consecutive record batches of a Parquet file."""
+    import pyarrow.parquet as pq
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.schema.names, dict(zip(batch.schema.names, batch.columns))
+
+class CsvWriter:
+    """Streams priced chunks to a CSV file."""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='')
+        self._writer = csv.writer(self._file)
+        self._header_written = False
+
+    def write(self, columns):
+        names = list(columns)
+        if not self._header_written:
+            self._writer.writerow(names)
+            self._header_written = True
+        self._writer.writerows(zip(*(_as_list(values) for values in columns.values())))
+
+    def close(self):
+        self._file.close()
+
+def _is_numeric(values):
+    """Return True if every entry of a column of strings or numbers parses as a float."""
+    try:
+        np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+class ParquetWriter:
+    """
+    Streams priced chunks to a Parquet file, one row group per chunk.
+
+    CSV input columns arrive as strings, so the column types are inferred
+    once from the first chunk: columns whose entries all parse as numbers
+    are written as float64, with unparseable entries in later chunks
+    becoming NaN, and the rest are written as strings.
+    """
+
+    def __init__(self, path):
+        import pyarrow.parquet as pq
+        self._pq = pq
+        self._path = path
+        self._writer = None
+        self._numeric = None
+
+    def write(self, columns):
+        import pyarrow as pa
+        if self._numeric is None:
+            self._numeric = {name for name, values in columns.items()
+                             if not isinstance(values, (pa.Array, pa.ChunkedArray)) and _is_numeric(values)}
+        table = pa.table({name: values if isinstance(values, (pa.Array, pa.ChunkedArray))
+                          else pa.array(_to_float(values)) if name in self._numeric
+                          else pa.array(values)
+                          for name, values in columns.items()})
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def price_chunk(columns, mapping, outputs, engine=BlackScholes):
+    """
+    Price one chunk of contracts.
+
+    Parameters:
+    columns (dict): Input column name -> values
+    mapping (dict): Model input (S, K, r, T, sigma) -> input column name
+    outputs (list): Names of the price_and_greeks results to return
+    engine: Object providing price_and_greeks, e.g. BlackScholes or a ParallelPricer
+
+    Returns:
+    dict: Output name -> float64 array; rows with invalid inputs are NaN
+    """
+    S, K, r, T, sigma = (_to_float(columns[mapping[name]]) for name in INPUTS)
+    valid = (S > 0) & (K > 0) & (T > 0) & (sigma > 0) & np.isfinite(r)
+    results = engine.price_and_greeks(S[valid], K[valid], r[valid], T[valid], sigma[valid])
+    priced = {}
+    for name in outputs:
+        column = np.full(len(S), np.nan)
+        column[valid] = results[name]
+        priced[name] = column
+    return priced
+
+def price_file(input_path, output_path, mapping=None, outputs=PRICES, chunk_size=100000,
+               keep=None, input_format=None, output_format=None, progress=sys.stderr,
+               engine=BlackScholes):
+    """
+    Price every contract in input_path and stream the results to output_path.
+
+    Parameters:
+    input_path (str): CSV or Parquet file of contracts
+    output_path (str): Destination CSV or Parquet file
+    mapping (dict): Model input -> input column name, defaulting to the input name
+    outputs (list): Names of the price_and_greeks results to write
+    chunk_size (int): Rows read, priced and written at a time
+    keep (list): Input columns copied to the output (default: all)
+    input_format, output_format (str): 'csv' or 'parquet', inferred from the extension if None
+    progress (file): Stream for rows/sec progress reports, or None for silence
+    engine: Object providing price_and_greeks, e.g. BlackScholes or a ParallelPricer
+
+    Returns:
+    dict: Total rows, elapsed seconds and rows per second
+    """
+    mapping = dict({name: name for name in INPUTS}, **(mapping or {}))
+    reader = read_parquet_chunks if file_format(input_path, input_format) == 'parquet' else read_csv_chunks
+    writer_class = ParquetWriter if file_format(output_path, output_format) == 'parquet' else CsvWriter
+
+    writer = writer_class(output_path)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for header, columns in reader(input_path, chunk_size):
+            kept = header if keep is None else keep
+            missing = [c for c in [mapping[name] for name in INPUTS] + list(kept) if c not in columns]
+            if missing:
+                raise ValueError(f"input is missing column(s): {', '.join(missing)}")
+            priced = price_chunk(columns, mapping, outputs, engine)
+            out = {name: columns[name] for name in kept}
+            out.update(priced)
+            writer.write(out)
+
+            rows += len(columns[mapping['S']])
+            elapsed = time.perf_counter() - start
+            if progress is not None:
+                print(f'{rows} rows priced, {rows / elapsed:,.0f} rows/sec', file=progress)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}
+
+def parse_mapping(text):
+    """Parse 'S=spot,K=strike' into {'S': 'spot', 'K': 'strike'}."""
+    mapping = {}
+    for item in filter(None, text.split(',')):
+        name, _, column = item.partition('=')
+        if name not in INPUTS or not column:
+            raise argparse.ArgumentTypeError(
+                f"invalid mapping '{item}', expected one of {', '.join(INPUTS)}=<column>")
+        mapping[name] = column
+    return mapping
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='CSV or Parquet file of contracts')
+    parser.add_argument('output', help='CSV or Parquet file to write')
+    parser.add_argument('--columns', type=parse_mapping, default={},
+                        help='Map model inputs to input columns, e.g. S=spot,K=strike,r=rate,T=expiry,sigma=vol')
+    parser.add_argument('--greeks', default='',
+                        help=f"Comma-separated Greeks to output, or 'all' ({', '.join(GREEKS)})")
+    parser.add_argument('--no-prices', action='store_true', help='Omit call_price and put_price')
+    parser.add_argument('--keep', help='Comma-separated input columns to copy to the output (default: all)')
+    parser.add_argument('--chunk-size', type=int, default=100000, help='Rows per chunk (default: 100000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes each chunk is sharded across (default: 1)')
+    parser.add_argument('--input-format', choices=('csv', 'parquet'))
+    parser.add_argument('--output-format', choices=('csv', 'parquet'))
+    parser.add_argument('--quiet', action='store_true', help='Suppress progress output')
+    args = parser.parse_args(argv)
+
+    greeks = list(GREEKS) if args.greeks == 'all' else [g for g in args.greeks.split(',') if g]
+    unknown = set(greeks) - set(GREEKS)
+    if unknown:
+        parser.error(f"unknown Greek(s): {', '.join(sorted(unknown))}")
+    outputs = ([] if args.no_prices else list(PRICES)) + greeks
+    keep = None if args.keep is None else [c for c in args.keep.split(',') if c]
+
+    engine = BlackScholes
+    if args.workers > 1:
+        engine = ParallelPricer(args.workers, chunk_size=-(-args.chunk_size // args.workers))
+    try:
+        summary = price_file(args.input, args.output, args.columns, outputs, args.chunk_size, keep,
+                             args.input_format, args.output_format, None if args.quiet else sys.stderr,
+                             engine)
+    except ValueError as e:
+        parser.exit(1, f'{parser.prog}: error: {e}\n')
+    finally:
+        if engine is not BlackScholes:
+            engine.close()
+    print(f"Priced {summary['rows']} rows in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_sec']:,.0f} rows/sec)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+import numpy as np
+from black_scholes import BlackScholes
+from chain import CALL
+
+# Grid axes, in the order of the result cube's dimensions
+AXES = ('spot', 'vol', 'rate', 'horizon')
+
+# Aggregated per-scenario Greeks and the price_and_greeks keys for calls and puts
+GREEKS = {
+    'delta': ('delta_call', 'delta_put'),
+    'gamma': ('gamma', 'gamma'),
+    'vega': ('vega', 'vega'),
+    'theta': ('theta_call', 'theta_put'),
+    'rho': ('rho_call', 'rho_put')
+}
+
+class ScenarioResult:
+    """
+    Output of ScenarioEngine.run. Every array has the grid shape
+    (n_spot, n_vol, n_rate, n_horizon), except position_pnl which adds a
+    trailing positions axis when it was requested.
+
+    Attributes:
+    shocks (dict): Axis name -> the shock values along that axis
+    pnl (ndarray): Full-revaluation portfolio PnL per scenario
+    greeks (dict): 'delta', 'gamma', 'vega', 'theta', 'rho' -> quantity-weighted
+                   portfolio Greek in each shocked state
+    approx_pnl (ndarray): Delta-gamma-vega estimate of the portfolio PnL
+    position_pnl (ndarray or None): Per-position PnL cube
+    """
+
+    def __init__(self, shocks, pnl, greeks, approx_pnl, position_pnl=None):
+        self.shocks = shocks
+        self.pnl = pnl
+        self.greeks = greeks
+        self.approx_pnl = approx_pnl
+        self.position_pnl = position_pnl
+
+    @property
+    def shape(self):
+        return self.pnl.shape
+
+    @property
+    def approx_error(self):
+        """Full revaluation minus the delta-gamma-vega approximation."""
+        return self.pnl - self.approx_pnl
+
+    def worst(self):
+        """Return the shocks and PnL of the worst scenario."""
+        index = np.unravel_index(np.argmin(self.pnl), self.shape)
+        return dict({axis: float(self.shocks[axis][i]) for axis, i in zip(AXES, index)},
+                    pnl=float(self.pnl[index]))
+
+class ScenarioEngine:
+    """
+    Stress-tests a book of option positions over a grid of spot, vol, rate
+    and time-decay shocks.
+
+    Each chunk of scenarios is revalued against every position in one
+    broadcast BlackScholes.price_and_greeks call. Working memory therefore
+    stays bounded by chunk_cells whatever the grid size. Alongside full
+    revaluation, every scenario gets the delta-gamma-vega estimate
+    built from the base-state delta, gamma and vega, so the quality of the
+    approximation can be checked scenario by scenario.
+    """
+
+    def __init__(self, positions, chunk_cells=1000000):
+        """
+        Parameters:
+        positions (OptionChain): Contracts with their option types and quantities
+        chunk_cells (int): Maximum scenario x position cells revalued at once
+        """
+        self.positions = positions
+        self.chunk_cells = chunk_cells
+        self.is_call = positions.option_type == CALL
+        self.quantity = positions.quantity
+        self.base_value = positions.prices()
+
+        # Base-state sensitivities for the delta-gamma-vega approximation
+        self.delta = np.where(self.is_call, BlackScholes.delta_call(positions), BlackScholes.delta_put(positions))
+        self.gamma = BlackScholes.gamma(positions)
+        self.vega = BlackScholes.vega(positions)
+
+    def run(self, spot=(0.0,), vol=(0.0,), rate=(0.0,), horizon=(0.0,), keep_positions=False):
+        """
+        Revalue the book under every combination of shocks.
+
+        Parameters:
+        spot (array): Relative spot moves, e.g. -0.1 for a 10% fall
+        vol (array): Absolute volatility shifts, e.g. 0.05 for +5 vol points
+        rate (array): Absolute interest rate shifts
+        horizon (array): Elapsed time in years; positions expiring within it
+                         are valued at intrinsic
+        keep_positions (bool): Also return the per-position PnL cube
+                               (n_scenarios x n_positions floats)
+
+        Returns:
+        ScenarioResult: PnL, aggregated Greeks and the delta-gamma-vega comparison
+        """
+        shocks = {axis: np.atleast_1d(np.asarray(values, dtype=float))
+                  for axis, values in zip(AXES, (spot, vol, rate, horizon))}
+        shape = tuple(len(values) for values in shocks.values())
+        grid = [a.reshape(-1) for a in np.meshgrid(*shocks.values(), indexing='ij')]
+        n = grid[0].size
+
+        pnl = np.empty(n)
+        approx = np.empty(n)
+        greeks = {name: np.empty(n) for name in GREEKS}
+        position_pnl = np.empty((n, len(self.positions))) if keep_positions else None
+
+        chunk = max(1, self.chunk_cells // max(len(self.positions), 1))
+        for start in range(0, n, chunk):
+            block = slice(start, start + chunk)
+            values, block_greeks = self._revalue(*(g[block, None] for g in grid))
+            position_block = values - self.base_value
+            pnl[block] = position_block @ self.quantity
+            for name in GREEKS:
+                greeks[name][block] = block_greeks[name] @ self.quantity
+            if keep_positions:
+                position_pnl[block] = position_block * self.quantity
+            approx[block] = self._approximate(grid[0][block, None], grid[1][block, None]) @ self.quantity
+
+        return ScenarioResult(shocks, pnl.reshape(shape), {name: g.reshape(shape) for name, g in greeks.items()},
+                              approx.reshape(shape),
+                              None if position_pnl is None else position_pnl.reshape(shape + (-1,)))
+
+    def _revalue(self, spot, vol, rate, horizon):
+        """Per-position values and Greeks for a block of scenarios (rows) by positions (columns)."""
+        S, K, r, T, sigma = self.positions.pricing_args()
+        S = S * (1 + spot)
+        sigma = np.maximum(sigma + vol, 1e-8)
+        r = r + rate
+        T = T - horizon
+        expired = T <= 0
+        results = BlackScholes.price_and_greeks(S, K, r, np.where(expired, 1.0, T), sigma)
+
+        values = np.where(self.is_call, results['call_price'], results['put_price'])
+        greeks = {name: np.where(self.is_call, results[call], results[put])
+                  for name, (call, put) in GREEKS.items()}
+        if expired.any():
+            # Expired positions are worth their intrinsic value and carry no risk but delta
+            intrinsic = np.where(self.is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+            values = np.where(expired, intrinsic, values)
+            in_the_money = np.where(self.is_call, S > K, S < K)
+            greeks['delta'] = np.where(expired, np.where(self.is_call, 1.0, -1.0) * in_the_money, greeks['delta'])
+            for name in ('gamma', 'vega', 'theta', 'rho'):
+                greeks[name] = np.where(expired, 0.0, greeks[name])
+        return values, greeks
+
+    def _approximate(self, spot, vol):
+        """Delta-gamma-vega PnL per position; rate and horizon shocks are not captured."""
+        dS = self.positions.S * spot
+        return self.delta * dS + 0.5 * self.gamma * dS**2 + self.vega * vol
@@ -0,0 +1,43 @@
+import numpy as np
+from black_scholes import BlackScholes
+from book import OptionBook, OUTPUTS
+
+def make_book(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return OptionBook(rng.uniform(50, 150, n), rng.uniform(50, 150, n), rng.uniform(0.0, 0.1, n),
+                      rng.uniform(0.05, 3.0, n), rng.uniform(0.05, 0.8, n))
+
+def assert_matches_full_repricing(book):
+    expected = BlackScholes.price_and_greeks(book.S, book.K, book.r, book.T, book.sigma)
+    for name in OUTPUTS:
+        np.testing.assert_allclose(book.get(name), expected[name], rtol=1e-12, atol=1e-12, err_msg=name)
+
+def test_subset_updates_patch_cached_outputs():
+    book = make_book()
+    cached = book.price_and_greeks()
+    index = np.array([3, 500, 999])
+    changed = np.r_[index, 10:20]
+    untouched = {name: np.delete(values, changed) for name, values in cached.items()}
+
+    book.update_spot(book.S[index] * 1.05, index)
+    book.update_vol(0.35, slice(10, 20))
+    book.update_rate(0.02, index)
+
+    # Outputs are patched in place and the other contracts keep their values
+    for name in ('call_price', 'gamma', 'theta_put'):
+        assert book.get(name) is cached[name]
+    for name in OUTPUTS:
+        np.testing.assert_array_equal(np.delete(book.get(name), changed), untouched[name], err_msg=name)
+    assert_matches_full_repricing(book)
+
+def test_outputs_requested_after_updates_are_computed_lazily():
+    book = make_book()
+    book.get('call_price')
+    book.update_spot(book.S * 0.9)
+    assert_matches_full_repricing(book)
+
+def test_scalar_book():
+    book = OptionBook(100.0, 105.0, 0.05, 1.0, 0.2)
+    book.get('theta_call')
+    book.update_spot(101.0, 0)
+    assert_matches_full_repricing(book)
@@ -0,0 +1,11 @@
+import pytest
+from black_scholes import BlackScholes, MonteCarloEngine
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_monte_carlo_vanilla_control_variate_is_not_degenerate(option_type):
+    exact = (BlackScholes.call_price if option_type == 'call' else BlackScholes.put_price)(100, 100, 0.05, 1, 0.2)
+    plain = MonteCarloEngine(seed=1, control_variate=False).price(100, 100, 0.05, 1, 0.2, option_type)
+    controlled = MonteCarloEngine(seed=1).price(100, 100, 0.05, 1, 0.2, option_type)
+    assert 0 < controlled.std_error < plain.std_error
+    assert controlled.price != exact
+    assert abs(controlled.price - exact) < 4 * controlled.std_error
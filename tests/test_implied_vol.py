@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from black_scholes import BlackScholes
+
+def random_quotes(n=5000, moneyness=(0.7, 1.4), seed=0):
+    """
+    Random contracts whose vega is large enough for the vol to be
+    identifiable from a double-precision price; beyond that the time value
+    drowns in the rounding of the intrinsic value and any vol fits.
+    """
+    rng = np.random.default_rng(seed)
+    S = rng.uniform(50, 150, n)
+    quotes = (S, S * rng.uniform(*moneyness, n), rng.uniform(0.0, 0.1, n),
+              rng.uniform(0.05, 3.0, n), rng.uniform(0.05, 0.8, n))
+    keep = BlackScholes.vega(*quotes) > 1e-2
+    return tuple(x[keep] for x in quotes)
+
+def quote_prices(S, K, r, T, sigma, option_type):
+    return BlackScholes.price_and_greeks(S, K, r, T, sigma)[f'{option_type}_price']
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_round_trip(option_type):
+    S, K, r, T, sigma = random_quotes()
+    vol = BlackScholes.implied_vol(quote_prices(S, K, r, T, sigma, option_type), S, K, r, T, option_type)
+    np.testing.assert_allclose(vol, sigma, atol=1e-8)
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+@pytest.mark.parametrize('moneyness', [(0.3, 0.5), (2.0, 3.0)])
+def test_deep_in_and_out_of_the_money(option_type, moneyness):
+    S, K, r, T, sigma = random_quotes(5000, moneyness)
+    assert len(S) > 500
+    vol = BlackScholes.implied_vol(quote_prices(S, K, r, T, sigma, option_type), S, K, r, T, option_type)
+    np.testing.assert_allclose(vol, sigma, atol=1e-6)
+
+def test_scalar_and_mixed_types():
+    assert BlackScholes.implied_vol(BlackScholes.put_price(100, 90, 0.05, 1, 0.3), 100, 90, 0.05, 1, 'put') \
+        == pytest.approx(0.3, abs=1e-10)
+    prices = [BlackScholes.call_price(100, 110, 0.05, 1, 0.25), BlackScholes.put_price(100, 110, 0.05, 1, 0.25)]
+    np.testing.assert_allclose(BlackScholes.implied_vol(prices, 100, 110, 0.05, 1, ['call', 'put']), 0.25, atol=1e-10)
+
+def test_prices_outside_no_arbitrage_bounds_are_nan():
+    S, K, r, T = 100.0, 100.0, 0.05, 1.0
+    intrinsic_call = S - K * np.exp(-r * T)
+    prices = [-1.0, 0.0, intrinsic_call - 0.01, S, S + 1]
+    assert np.isnan(BlackScholes.implied_vol(prices, S, K, r, T, 'call')).all()
+    assert np.isnan(BlackScholes.implied_vol([0.0, K * np.exp(-r * T) + 1], S, K, r, T, 'put')).all()
+    assert np.isnan(BlackScholes.implied_vol(5.0, S, K, r, 0.0, 'call'))
+
+def test_invalid_option_type():
+    with pytest.raises(ValueError):
+        BlackScholes.implied_vol(5.0, 100, 100, 0.05, 1, 'straddle')
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_converges_in_few_iterations(option_type):
+    # The Corrado-Miller start leaves most quotes within two Halley steps
+    S, K, r, T, sigma = random_quotes()
+    prices = quote_prices(S, K, r, T, sigma, option_type)
+    vol = BlackScholes.implied_vol(prices, S, K, r, T, option_type, max_iter=2)
+    assert np.mean(np.abs(vol - sigma) < 1e-6) > 0.9
+    vol = BlackScholes.implied_vol(prices, S, K, r, T, option_type, max_iter=3)
+    assert np.mean(np.abs(vol - sigma) < 1e-6) > 0.95
+
+def test_api_implied_vol():
+    import app
+    client = app.app.test_client()
+    call = BlackScholes.call_price(100, 105, 0.05, 1, 0.2)
+    put = BlackScholes.put_price(100, 105, 0.05, 1, 0.2)
+    response = client.post('/api/implied_vol', json={
+        'option_price': [call, put, 1000.0], 'stock_price': 100, 'strike_price': 105,
+        'interest_rate': 5, 'maturity': 1, 'option_type': ['call', 'put', 'call']})
+    assert response.status_code == 200
+    vols = response.json['implied_volatility']
+    assert vols[0] == pytest.approx(20.0, abs=1e-8) and vols[1] == pytest.approx(20.0, abs=1e-8)
+    assert vols[2] is None
+
+    assert client.post('/api/implied_vol', json={'stock_price': 100}).status_code == 400
+    assert client.post('/api/implied_vol', json={'option_price': [1, 2], 'stock_price': [1, 2, 3]}).status_code == 400
+    assert client.post('/api/implied_vol', json={'option_price': 5, 'option_type': 'straddle'}).status_code == 400
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+import black_scholes
+import jit_kernels
+from black_scholes import BlackScholes
+
+pytestmark = pytest.mark.skipif(not jit_kernels.AVAILABLE, reason='Numba is not installed')
+
+N = jit_kernels.MIN_SIZE
+
+def random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(1, 1000, n), rng.uniform(1, 1000, n), rng.uniform(0.0, 0.1, n),
+            rng.uniform(0.01, 5.0, n), rng.uniform(0.05, 1.0, n))
+
+@pytest.fixture
+def kernels():
+    """Price through NumPy and through Numba with the same inputs."""
+    previous = black_scholes.get_kernel_backend(), black_scholes.get_normal_backend()
+    black_scholes.set_normal_backend('ndtr')
+
+    def price(*args, **kwargs):
+        results = {}
+        for backend in ('numpy', 'numba'):
+            black_scholes.set_kernel_backend(backend)
+            results[backend] = BlackScholes.price_and_greeks(*args, **kwargs)
+        return results['numpy'], results['numba']
+    yield price
+    black_scholes.set_kernel_backend(previous[0])
+    black_scholes.set_normal_backend(previous[1])
+
+def assert_parity(expected, actual, rtol, atol=0.0):
+    assert expected.keys() == actual.keys()
+    for name in expected:
+        assert actual[name].dtype == expected[name].dtype, name
+        assert actual[name].shape == expected[name].shape, name
+        np.testing.assert_allclose(actual[name], expected[name], rtol=rtol, atol=atol, err_msg=name)
+
+def test_float64_parity(kernels):
+    expected, actual = kernels(*random_inputs(N))
+    assert_parity(expected, actual, rtol=1e-10, atol=1e-12)
+
+def test_float32_within_documented_bounds(kernels):
+    # The domain FLOAT32_ERROR_BOUNDS was measured over
+    rng = np.random.default_rng(1)
+    S = rng.uniform(1, 1000, N)
+    inputs = (S, S / rng.uniform(0.5, 2.0, N), rng.uniform(0.0, 0.1, N),
+              rng.uniform(1 / 365, 5.0, N), rng.uniform(0.05, 1.0, N))
+    reference, _ = kernels(*inputs)
+    for results in kernels(*inputs, dtype=np.float32):
+        for name, bound in black_scholes.FLOAT32_ERROR_BOUNDS.items():
+            assert results[name].dtype == np.float32, name
+            scale = 1 / S if name == 'gamma' else (1 if name.startswith('delta') else S)
+            assert np.all(np.abs(results[name] - reference[name]) <= bound * scale), name
+
+def test_integer_inputs_are_priced_as_float(kernels):
+    S = np.arange(N) % 100 + 50
+    expected, actual = kernels(S, 100, 0, 1, 1)
+    assert actual['call_price'].dtype == np.float64
+    assert np.all(actual['delta_call'] > 0)
+    assert_parity(expected, actual, rtol=1e-10, atol=1e-12)
+
+def test_nan_inputs_propagate(kernels):
+    S, K, r, T, sigma = random_inputs(N)
+    S[::7] = np.nan
+    sigma[::11] = np.nan
+    with np.errstate(invalid='ignore'):
+        expected, actual = kernels(S, K, r, T, sigma)
+    for name in expected:
+        np.testing.assert_array_equal(np.isnan(actual[name]), np.isnan(expected[name]), err_msg=name)
+    assert_parity(expected, actual, rtol=1e-10, atol=1e-12)
+
+def test_broadcast_shapes(kernels):
+    S = np.linspace(50, 150, 250)[:, None]
+    sigma = np.linspace(0.05, 1.0, 100)[None, :]
+    expected, actual = kernels(S, 100.0, 0.05, np.array([[1.0]]), sigma)
+    assert actual['gamma'].shape == (250, 100)
+    assert_parity(expected, actual, rtol=1e-10, atol=1e-12)
+
+def test_float32_kernel_rounds_only_on_store(kernels):
+    inputs = tuple(x.astype(np.float32) for x in random_inputs(N))
+    reference, _ = kernels(*(x.astype(np.float64) for x in inputs))
+    _, actual = kernels(*inputs)
+    for name in reference:
+        expected = reference[name].astype(np.float32)
+        ulps = np.abs(actual[name].astype(np.float64) - expected) / np.spacing(np.abs(expected))
+        assert np.nanmax(ulps) <= 1, name
+
+@pytest.mark.parametrize('dtype', [np.int8, np.int16, np.int32, np.uint8, np.float32])
+def test_output_dtype_does_not_depend_on_backend(kernels, dtype):
+    S = (np.arange(N) % 100 + 20).astype(dtype)
+    K = np.full(N, 60, dtype=dtype)
+    expected, actual = kernels(S, K, 0.05, 1, 0.5)
+    assert expected['call_price'].dtype == (np.float32 if dtype == np.float32 else np.float64)
+    assert_parity(expected, actual, rtol=1e-5 if dtype == np.float32 else 1e-10, atol=1e-5)
+    mixed_expected, mixed_actual = kernels(S, K.astype(np.float64), 0.05, 1, 0.5)
+    assert mixed_actual['gamma'].dtype == mixed_expected['gamma'].dtype == np.float64
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+import black_scholes
+from black_scholes import NORMAL_BACKENDS
+
+TOLERANCE = 1e-12
+
+# Dense over the body of the distribution, plus both tails out to +-40
+POINTS = np.concatenate([np.linspace(-40, 40, 8001), np.linspace(-8, 8, 100001)])
+
+@pytest.fixture(params=sorted(NORMAL_BACKENDS))
+def backend(request):
+    previous = black_scholes.get_normal_backend()
+    black_scholes.set_normal_backend(request.param)
+    yield request.param
+    black_scholes.set_normal_backend(previous)
+
+def test_cdf_matches_scipy_over_domain(backend):
+    np.testing.assert_allclose(black_scholes.norm_cdf(POINTS), norm.cdf(POINTS), rtol=0, atol=TOLERANCE)
+
+def test_pdf_matches_scipy_over_domain(backend):
+    np.testing.assert_allclose(black_scholes.norm_pdf(POINTS), norm.pdf(POINTS), rtol=0, atol=TOLERANCE)
+
+@pytest.mark.parametrize('x', [-40.0, -8.5, -1.0, 0.0, 0.3, 2.5, 37.0])
+def test_scalars_match_scipy(backend, x):
+    cdf = black_scholes.norm_cdf(x)
+    pdf = black_scholes.norm_pdf(x)
+    assert np.ndim(cdf) == 0 and np.ndim(pdf) == 0
+    assert np.result_type(cdf) == np.float64
+    assert abs(cdf - norm.cdf(x)) <= TOLERANCE
+    assert abs(pdf - norm.pdf(x)) <= TOLERANCE
+
+def test_array_shape_is_preserved(backend):
+    x = POINTS[:600].reshape(20, 30)
+    assert black_scholes.norm_cdf(x).shape == (20, 30)
+    assert black_scholes.norm_pdf(x).shape == (20, 30)
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        black_scholes.set_normal_backend('erf')
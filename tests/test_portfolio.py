@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from portfolio import price_file
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+def test_csv_to_parquet_writes_numeric_columns_as_float64(tmp_path):
+    source = tmp_path / 'positions.csv'
+    source.write_text('id,S,K,r,T,sigma\n'
+                      'a1,100,100,0.05,1,0.2\n'
+                      'b2,90,100,0.05,0.5,0.3\n'
+                      'c3,bad,100,0.05,1,0.2\n')
+    target = tmp_path / 'priced.parquet'
+    price_file(str(source), str(target), chunk_size=2, progress=None)
+
+    table = pq.read_table(target)
+    assert table.schema.field('id').type == pa.string()
+    for name in ('S', 'K', 'r', 'T', 'sigma', 'call_price', 'put_price'):
+        assert table.schema.field(name).type == pa.float64(), name
+    assert table.num_rows == 3
+    S = table.column('S').to_numpy()
+    np.testing.assert_array_equal(S[:2], [100.0, 90.0])
+    assert np.isnan(S[2]) and np.isnan(table.column('call_price').to_numpy()[2])
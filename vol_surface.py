@@ -0,0 +1,235 @@
+import threading
+import time
+import uuid
+import numpy as np
+
+# Order of the raw SVI parameters in each coefficient row
+SVI_PARAMS = ('a', 'b', 'rho', 'm', 's')
+
+# Points evaluated per block by VolSurface.total_variance
+EVAL_BLOCK = 16384
+
+def svi_total_variance(k, a, b, rho, m, s):
+    """
+    Raw SVI total implied variance w(k) = a + b * (rho * (k - m) + sqrt((k - m)^2 + s^2)),
+    where k is the log forward moneyness log(K / F).
+    """
+    x = k - m
+    return a + b * (rho * x + np.sqrt(x * x + s * s))
+
+def calibrate_svi_slice(k, w, weights=None):
+    """
+    Fit raw SVI parameters to one expiry's total variances by bounded
+    least squares.
+
+    Parameters:
+    k (array): Log forward moneyness of each quote
+    w (array): Total implied variance sigma^2 * T of each quote
+    weights (array): Optional per-quote weights
+
+    Returns:
+    ndarray: (a, b, rho, m, s)
+    """
+    from scipy.optimize import least_squares
+    k = np.asarray(k, dtype=float)
+    w = np.asarray(w, dtype=float)
+    weights = np.ones_like(w) if weights is None else np.asarray(weights, dtype=float)
+    if len(k) < len(SVI_PARAMS):
+        raise ValueError(f'an SVI slice needs at least {len(SVI_PARAMS)} quotes, got {len(k)}')
+
+    # Start from a symmetric smile centred on the lowest quoted variance
+    span = max(k.max() - k.min(), 1e-3)
+    s0 = 0.1 * span
+    b0 = max((w.max() - w.min()) / span, 1e-3)
+    m0 = k[np.argmin(w)]
+    x0 = [w.min() - b0 * s0, b0, 0.0, m0, s0]
+    lower = [-w.max(), 0.0, -0.999, k.min() - span, 1e-4]
+    upper = [w.max(), np.inf, 0.999, k.max() + span, 10.0 * span]
+
+    def residuals(p):
+        return weights * (svi_total_variance(k, *p) - w)
+    fit = least_squares(residuals, np.clip(x0, lower, upper), bounds=(lower, upper), method='trf')
+    return fit.x
+
+class VolSurface:
+    """
+    An implied volatility surface made of one raw SVI smile per expiry.
+
+    The whole surface is two small arrays: the expiries and an
+    (n_expiries, 5) table of SVI coefficients. Between expiries the total
+    variance is interpolated linearly in T at fixed log forward moneyness.
+    Before the first and after the last expiry the nearest smile is
+    extended at constant implied volatility. Moneyness is measured
+    against the forward S * exp(r * T) for the spot and rate the surface
+    was calibrated at (sticky strike), unless another spot is passed.
+    """
+
+    def __init__(self, spot, rate, expiries, params):
+        """
+        Parameters:
+        spot (float): Spot price the surface was calibrated at
+        rate (float): Risk-free rate used for the forwards
+        expiries (array): Increasing expiries in years
+        params (array): Array of shape (len(expiries), 5) of raw SVI coefficients
+        """
+        self.spot = float(spot)
+        self.rate = float(rate)
+        self.expiries = np.array(expiries, dtype=float)
+        self.params = np.array(params, dtype=float).reshape(len(self.expiries), len(SVI_PARAMS))
+        if np.any(np.diff(self.expiries) <= 0):
+            raise ValueError('expiries must be strictly increasing')
+        # Surfaces are shared between requests through the store, so freeze them
+        self.expiries.flags.writeable = False
+        self.params.flags.writeable = False
+
+    @classmethod
+    def calibrate(cls, spot, rate, strikes, maturities, vols, weights=None):
+        """
+        Calibrate one SVI smile per distinct maturity from implied vol quotes.
+
+        Parameters:
+        spot (float): Current stock price
+        rate (float): Risk-free interest rate
+        strikes, maturities, vols (array): One entry per quote; vols as decimals
+        weights (array): Optional per-quote weights, e.g. vegas
+
+        Returns:
+        VolSurface: The calibrated surface
+        """
+        strikes, maturities, vols = (np.asarray(x, dtype=float).reshape(-1)
+                                     for x in np.broadcast_arrays(strikes, maturities, vols))
+        weights = None if weights is None else np.broadcast_to(weights, strikes.shape).astype(float)
+        valid = (strikes > 0) & (maturities > 0) & (vols > 0)
+        if not valid.all():
+            raise ValueError('strikes, maturities and vols must all be positive')
+        k = np.log(strikes / spot) - rate * maturities
+        w = vols**2 * maturities
+        expiries = np.unique(maturities)
+        params = [calibrate_svi_slice(k[maturities == T], w[maturities == T],
+                                      None if weights is None else weights[maturities == T])
+                  for T in expiries]
+        return cls(spot, rate, expiries, np.array(params))
+
+    @property
+    def nbytes(self):
+        """Memory held by the coefficient arrays in bytes."""
+        return self.expiries.nbytes + self.params.nbytes
+
+    def total_variance(self, K, T, spot=None):
+        """
+        Evaluate the total implied variance sigma^2 * T at strikes K and
+        maturities T, in their broadcast shape.
+        """
+        K, T = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(T, dtype=float))
+        shape = K.shape
+        K, T = K.reshape(-1), T.reshape(-1)
+        out = np.empty(K.size)
+        # Work in cache-sized blocks so the temporaries never leave L2
+        for start in range(0, K.size, EVAL_BLOCK):
+            block = slice(start, start + EVAL_BLOCK)
+            out[block] = self._total_variance(K[block], T[block], self.spot if spot is None else spot)
+        return out.reshape(shape)[()]
+
+    def _total_variance(self, K, T, spot):
+        k = np.log(K / spot)
+        k -= self.rate * T
+
+        # Bracketing expiries; both indices coincide outside the quoted range.
+        # Counting crossed expiries beats searchsorted for a handful of them.
+        n = len(self.expiries)
+        upper = np.zeros(len(T), dtype=np.intp)
+        for expiry in self.expiries:
+            upper += T > expiry
+        hi = np.minimum(upper, n - 1)
+        lo = np.maximum(upper - 1, 0)
+        w_lo = svi_total_variance(k, *(column.take(lo) for column in self.params.T))
+        w_hi = svi_total_variance(k, *(column.take(hi) for column in self.params.T))
+        t_lo = self.expiries.take(lo)
+        t_hi = self.expiries.take(hi)
+
+        # Linear in T between expiries; beyond the quoted ones the nearest
+        # smile is scaled by T / t_lo, i.e. held at constant implied vol
+        outside = hi == lo
+        t_hi[outside] = 2 * t_lo[outside]
+        w_hi -= w_lo
+        np.copyto(w_hi, w_lo, where=outside)
+        T = T - t_lo
+        T /= t_hi - t_lo
+        w_hi *= T
+        w_lo += w_hi
+        return np.maximum(w_lo, 0.0, out=w_lo)
+
+    def implied_vol(self, K, T, spot=None):
+        """
+        Evaluate implied volatilities (as decimals) at strikes K and
+        maturities T, in their broadcast shape.
+        """
+        return np.sqrt(self.total_variance(K, T, spot) / T)
+
+    def fit_error(self, strikes, maturities, vols):
+        """Return the maximum absolute implied vol error against a set of quotes."""
+        return float(np.max(np.abs(self.implied_vol(strikes, maturities) - vols)))
+
+    def to_dict(self):
+        """Describe the surface as plain lists, e.g. for a JSON response."""
+        return {
+            'spot': self.spot,
+            'rate': self.rate,
+            'expiries': self.expiries.tolist(),
+            'params': {name: self.params[:, i].tolist() for i, name in enumerate(SVI_PARAMS)}
+        }
+
+class SurfaceStore:
+    """
+    A thread-safe, in-process registry of calibrated surfaces. Each ID
+    holds a short history of versions so that requests can price against
+    a pinned version while a newer calibration is published.
+    """
+
+    def __init__(self, max_versions=8):
+        """
+        Parameters:
+        max_versions (int): Versions kept per surface ID; older ones are dropped
+        """
+        self.max_versions = max_versions
+        self._surfaces = {}
+        self._lock = threading.Lock()
+
+    def put(self, surface, surface_id=None):
+        """
+        Publish a surface as the newest version of surface_id.
+
+        Returns:
+        tuple: (surface_id, version); a new ID is generated if none is given
+        """
+        surface_id = surface_id or uuid.uuid4().hex[:12]
+        with self._lock:
+            history = self._surfaces.setdefault(surface_id, {})
+            version = max(history, default=0) + 1
+            history[version] = (surface, time.time())
+            for old in sorted(history)[:-self.max_versions]:
+                del history[old]
+        return surface_id, version
+
+    def get(self, surface_id, version=None):
+        """
+        Return a surface by ID, the latest version unless one is given.
+        Raises ValueError for unknown IDs or versions.
+        """
+        with self._lock:
+            history = self._surfaces.get(surface_id)
+            if not history:
+                raise ValueError(f"unknown vol surface '{surface_id}'")
+            version = max(history) if version is None else int(version)
+            if version not in history:
+                raise ValueError(f"vol surface '{surface_id}' has no version {version}")
+            return history[version][0]
+
+    def versions(self, surface_id):
+        """Return {version: creation timestamp} for surface_id."""
+        with self._lock:
+            return {version: created for version, (_, created) in self._surfaces.get(surface_id, {}).items()}
+
+    def __contains__(self, surface_id):
+        with self._lock:
+            return surface_id in self._surfaces